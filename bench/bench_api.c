@@ -0,0 +1,61 @@
+#define _POSIX_C_SOURCE 200809L
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include "wibesocket/wibesocket.h"
+#include "bench_api.h"
+
+static uint64_t now_ns(void){ struct timespec ts; clock_gettime(CLOCK_MONOTONIC,&ts); return (uint64_t)ts.tv_sec*1000000000ull+ts.tv_nsec; }
+
+static int cmp_u64(const void* a, const void* b) {
+    uint64_t x = *(const uint64_t*)a, y = *(const uint64_t*)b;
+    return (x > y) - (x < y);
+}
+
+static wibesocket_conn_t* open_conn(const char* uri) {
+    wibesocket_config_t cfg = {0}; cfg.handshake_timeout_ms = 5000; cfg.max_frame_size = (1u<<20);
+    return wibesocket_connect(uri, &cfg);
+}
+
+double bench_throughput_run(const char* uri, size_t len, size_t count) {
+    if (!uri) return -1.0;
+    wibesocket_conn_t* c = open_conn(uri);
+    if (!c) return -1.0;
+    char* payload = (char*)malloc(len ? len : 1);
+    if (!payload) { (void)wibesocket_close(c); return -1.0; }
+    memset(payload, 'A', len);
+    uint64_t start = now_ns();
+    for (size_t i = 0; i < count; i++) {
+        (void)wibesocket_send_binary(c, payload, len);
+    }
+    uint64_t end = now_ns();
+    double secs = (double)(end - start) / 1e9;
+    free(payload);
+    (void)wibesocket_close(c);
+    return (secs > 0.0) ? (double)count / secs : 0.0;
+}
+
+int bench_latency_run(const char* uri, size_t iters, double out[3]) {
+    if (!uri || !out || !iters) return -1;
+    wibesocket_conn_t* c = open_conn(uri);
+    if (!c) return -1;
+    uint64_t* samples = (uint64_t*)malloc(iters * sizeof(uint64_t));
+    if (!samples) { (void)wibesocket_close(c); return -1; }
+    for (size_t i = 0; i < iters; i++) {
+        uint64_t t0 = now_ns();
+        (void)wibesocket_send_text(c, "x", 1);
+        wibesocket_message_t msg; memset(&msg, 0, sizeof(msg));
+        /* Unpin the echo, or every later recv bails out with NOT_READY without reading */
+        if (wibesocket_recv(c, &msg, 1000) == WIBESOCKET_OK) wibesocket_release_payload(c);
+        uint64_t t1 = now_ns();
+        samples[i] = t1 - t0;
+    }
+    qsort(samples, iters, sizeof(uint64_t), cmp_u64);
+    out[0] = samples[(size_t)(iters * 0.50)] / 1e6;
+    out[1] = samples[(size_t)(iters * 0.90)] / 1e6;
+    out[2] = samples[(size_t)(iters * 0.99)] / 1e6;
+    free(samples);
+    (void)wibesocket_close(c);
+    return 0;
+}
@@ -0,0 +1,23 @@
+#ifndef WIBESOCKET_BENCH_API_H
+#define WIBESOCKET_BENCH_API_H
+
+#include <stddef.h>
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Benchmark entry points shared by the bench executables and run_bench.py (via ctypes).
+ * Each call opens and closes its own connection. */
+
+/* Sends count binary messages of len bytes; returns msgs/s, or a negative value on error. */
+double bench_throughput_run(const char* uri, size_t len, size_t count);
+
+/* Times iters 1-byte echo round trips; fills out[3] with p50/p90/p99 in ms. Returns 0 on success. */
+int bench_latency_run(const char* uri, size_t iters, double out[3]);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif /* WIBESOCKET_BENCH_API_H */
@@ -1,44 +1,254 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
+import collections
+import concurrent.futures
+import ctypes
+import functools
 import urllib.parse
 import json
+import multiprocessing
 import socket
 import os
+import re
 import subprocess
 import shutil
 import sys
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # numpy is optional; percentiles fall back to a full sort
+    np = None
+
+try:
+    import websockets  # type: ignore
+except ImportError:  # optional competitor; ensure_python_package() binds it after a late install
+    websockets = None
 
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 BUILD = os.path.join(ROOT, "build")
+BENCH_LIB = "libwibesocket_bench.so"
+
+# Result line printed by bench_lws_client ("... msgs/s=<rate>")
+_TPUT_RE = re.compile(r"msgs/s=([\d.]+)")
+
+
+def _spawn(cmd: List[str], **kw) -> subprocess.Popen:
+    """Popen on CPython's posix_spawn fast path, so launching a child doesn't fork this process.
+
+    That path needs an executable with a directory component and ``close_fds=False``; the latter
+    is safe here because Python creates its own descriptors non-inheritable (PEP 446).
+    """
+    exe = cmd[0] if os.path.dirname(cmd[0]) else (shutil.which(cmd[0]) or cmd[0])
+    return subprocess.Popen([exe] + list(cmd[1:]), close_fds=False, **kw)
 
 
 def run_cmd(cmd: List[str]) -> Tuple[int, str, str]:
-    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    """Run cmd to completion; returns (returncode, stdout, stderr) stripped.
+
+    Goes through _spawn, so cmake and the bench CLIs are launched with posix_spawn rather than fork.
+    """
+    p = _spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
     out, err = p.communicate()
     return p.returncode, (out or "").strip(), (err or "").strip()
 
 
+def run_cmd_last_line(cmd: List[str], err_lines: int = 20) -> Tuple[int, str, str]:
+    """Run cmd keeping only the last non-empty stdout line and a short stderr tail.
+
+    Output is streamed rather than buffered whole, since result-line callers never need the rest.
+    """
+    p = _spawn(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    assert p.stdout is not None and p.stderr is not None
+    err_tail: "collections.deque[str]" = collections.deque(maxlen=err_lines)
+    # Drain stderr concurrently so a chatty child can't block on a full pipe while we read stdout
+    err_reader = threading.Thread(target=err_tail.extend, args=(p.stderr,), daemon=True)
+    err_reader.start()
+    last = ""
+    for line in iter(p.stdout.readline, ""):
+        line = line.strip()
+        if line:
+            last = line
+    rc = p.wait()
+    err_reader.join()
+    return rc, last, "".join(err_tail).strip()
+
+
+_built = False
+_lws_tried = False
+
+
 def ensure_built() -> None:
+    global _built
+    if _built:
+        return
     if not os.path.isdir(BUILD):
         rc, out, err = run_cmd(["cmake", "-S", ROOT, "-B", BUILD])
         if rc != 0:
             print(err or out, file=sys.stderr)
             sys.exit(2)
-    for tgt in ("bench_throughput", "bench_latency"):
-        exe = os.path.join(BUILD, tgt)
-        if not os.path.exists(exe):
-            rc, out, err = run_cmd(["cmake", "--build", BUILD, "--target", tgt, "-j"])
-            if rc != 0:
-                print(err or out, file=sys.stderr)
-                sys.exit(2)
-    # Try to build libwebsockets client if present; ignore failures
+    if not os.path.exists(os.path.join(BUILD, BENCH_LIB)):
+        rc, out, err = run_cmd(["cmake", "--build", BUILD, "--target", "wibesocket_bench", "-j"])
+        if rc != 0:
+            print(err or out, file=sys.stderr)
+            sys.exit(2)
+    _built = True
+    _ensure_lws_built()
+
+
+def _ensure_lws_built() -> None:
+    # Try to build libwebsockets client if present; ignore failures, and only try once per run
+    global _lws_tried
+    if _lws_tried:
+        return
+    _lws_tried = True
     rc, out, err = run_cmd(["cmake", "--build", BUILD, "--target", "bench_lws_client", "-j"])
 
 
+_addr_cache: Dict[Tuple[str, int], Tuple[int, tuple]] = {}
+
+
+def _resolve(uri: str) -> Tuple[int, tuple]:
+    """Return (family, sockaddr) for the URI's host, resolving it only once per run."""
+    parts = urllib.parse.urlsplit(uri)
+    key = (parts.hostname or "", parts.port or 80)
+    hit = _addr_cache.get(key)
+    if hit is None:
+        family, _, _, _, sockaddr = socket.getaddrinfo(key[0], key[1], type=socket.SOCK_STREAM)[0]
+        hit = _addr_cache[key] = (family, sockaddr)
+    return hit
+
+
+# Kernel socket buffer size requested for competitor connections
+SOCK_BUF_BYTES = 4 << 20
+
+
+def _tune_sock(sock) -> None:
+    """Disable Nagle and enlarge kernel buffers so the bench measures protocol cost, not OS defaults."""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCK_BUF_BYTES)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCK_BUF_BYTES)
+
+
+def _connect_sock(uri: str, timeout_s: float) -> socket.socket:
+    """Blocking TCP connect to the pre-resolved address (for sync clients)."""
+    family, sockaddr = _resolve(uri)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        _tune_sock(sock)
+        sock.settimeout(timeout_s)
+        sock.connect(sockaddr)
+    except Exception:
+        sock.close()
+        raise
+    return sock
+
+
+def _tune_connected(ws) -> None:
+    # aiohttp owns its socket, so tune it after the handshake instead of before connect
+    try:
+        _tune_sock(ws.get_extra_info("socket"))
+    except Exception:
+        pass
+
+
+async def _open_sock(uri: str, timeout_s: float) -> socket.socket:
+    """Non-blocking TCP connect to the pre-resolved address on the running loop."""
+    family, sockaddr = _resolve(uri)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        _tune_sock(sock)
+        await asyncio.wait_for(asyncio.get_running_loop().sock_connect(sock, sockaddr), timeout=timeout_s)
+    except BaseException:
+        sock.close()
+        raise
+    return sock
+
+
+def _cached_resolver(aiohttp_mod, uri: str):
+    """aiohttp resolver that answers from the pre-resolved address instead of getaddrinfo."""
+    addr_family, sockaddr = _resolve(uri)
+
+    class _Resolver(aiohttp_mod.abc.AbstractResolver):
+        async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET):
+            return [{"hostname": host, "host": sockaddr[0], "port": sockaddr[1],
+                     "family": addr_family, "proto": 0, "flags": socket.AI_NUMERICHOST}]
+
+        async def close(self) -> None:
+            pass
+
+    return _Resolver()
+
+
+def _guarded(fn: Callable[[], float]) -> float:
+    """Run one competitor bench, mapping any failure to NaN (reported as n/a)."""
+    try:
+        return fn()
+    except Exception:
+        return float("nan")
+
+
+@functools.lru_cache(maxsize=None)
+def _payload(size: int) -> bytes:
+    """Return the shared b"A" * size payload, built once per size for the whole run."""
+    return b"A" * size
+
+
+def _as_payload(payload: Union[bytes, int]) -> bytes:
+    # Accept either a prebuilt payload or a length, for callers still passing sizes
+    return payload if isinstance(payload, bytes) else _payload(int(payload))
+
+
+def _sample_buffer(n: int):
+    """Preallocated storage for n latency samples: a float64 array when numpy is available."""
+    return np.empty(n, dtype=np.float64) if np is not None else [0.0] * n
+
+
+def _percentiles(samples: Sequence[float], scale: float = 1.0) -> Tuple[float, float, float]:
+    """Return (p50, p90, p99) of the samples multiplied by scale, or NaNs when there are none."""
+    n = len(samples)
+    if not n:
+        return (float("nan"), float("nan"), float("nan"))
+    # Same rank rule as the C benches (sorted[int(n * p)]) so every column is comparable
+    idxs = [min(int(n * p), n - 1) for p in (0.50, 0.90, 0.99)]
+    if np is not None:
+        # Linear-time selection on a contiguous float64 buffer instead of an O(n log n) sort of boxed floats
+        arr = samples if isinstance(samples, np.ndarray) else np.fromiter(samples, dtype=np.float64, count=n)
+        part = np.partition(arr, idxs)
+        p50, p90, p99 = (float(part[i]) * scale for i in idxs)
+        return (p50, p90, p99)
+    ordered = sorted(samples)
+    p50, p90, p99 = (ordered[i] * scale for i in idxs)
+    return (p50, p90, p99)
+
+
+async def _stall_guard(progress: Callable[[], int], timeout_s: float) -> None:
+    """Return once progress() stops advancing for timeout_s; one timer per period instead of a wait_for per call."""
+    seen = -1
+    while progress() != seen:
+        seen = progress()
+        await asyncio.sleep(timeout_s)
+
+
+async def _run_guarded(work: "asyncio.Future", progress: Callable[[], int], timeout_s: float) -> None:
+    """Await work, cancelling it if progress() stalls for timeout_s."""
+    guard = asyncio.ensure_future(_stall_guard(progress, timeout_s))
+    await asyncio.wait((work, guard), return_when=asyncio.FIRST_COMPLETED)
+    guard.cancel()
+    work.cancel()
+    try:
+        await work
+    except asyncio.CancelledError:
+        pass
+
+
+@functools.lru_cache(maxsize=None)
 def ensure_python_package(mod_name: str, pip_name: Optional[str] = None) -> bool:
+    """Import mod_name, pip-installing pip_name on failure; the outcome is cached, so pip runs at most once per package."""
     try:
         __import__(mod_name)
         return True
@@ -47,79 +257,165 @@ def ensure_python_package(mod_name: str, pip_name: Optional[str] = None) -> bool
     pip = [sys.executable, "-m", "pip", "install"]
     try:
         subprocess.check_call(pip + [pip_name or mod_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        __import__(mod_name)
-        return True
+        mod = __import__(mod_name)
     except Exception:
         return False
+    if mod_name in globals() and globals()[mod_name] is None:
+        globals()[mod_name] = mod  # fill in a module-level optional import
+    return True
+
+
+_thread_state = threading.local()
+_loops: List[asyncio.AbstractEventLoop] = []
+_ws_conns: Dict[asyncio.AbstractEventLoop, Dict[str, object]] = {}
+
+
+def _run(coro):
+    """Run coro on this thread's long-lived event loop instead of a fresh asyncio.run() loop per call.
+
+    The loop is created on first use, so it follows whichever policy (uvloop) is installed by then.
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None:
+        loop = _thread_state.loop = asyncio.new_event_loop()
+        _loops.append(loop)
+    return loop.run_until_complete(coro)
+
+
+def _close_loops() -> None:
+    """Close cached connections and the per-thread loops once no bench is running on them."""
+    for loop in _loops:
+        for ws in _ws_conns.pop(loop, {}).values():
+            try:
+                loop.run_until_complete(ws.close())
+            except Exception:
+                pass
+        loop.close()
+    _loops.clear()
+
+
+async def _websockets_conn(uri: str, timeout_s: float):
+    """This loop's websockets connection to uri, opened (and handshaken) once and reused across runs."""
+    conns = _ws_conns.setdefault(asyncio.get_running_loop(), {})
+    ws = conns.get(uri)
+    if ws is None:
+        sock = await _open_sock(uri, timeout_s)
+        ws = conns[uri] = await asyncio.wait_for(websockets.connect(uri, sock=sock, max_size=None), timeout=timeout_s)
+    return ws
+
+
+async def _discard_websockets_conn(uri: str) -> None:
+    """Drop a connection that may still hold unread echoes; the next run reconnects."""
+    ws = _ws_conns.get(asyncio.get_running_loop(), {}).pop(uri, None)
+    if ws is not None:
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
 
+async def ws_websockets_throughput(uri: str, payload: Union[bytes, int], count: int, timeout_s: float = 5.0, inflight: int = 32) -> Tuple[float, int, int]:
+    """Round-trip rate plus the nanoseconds spent awaiting ws.send() and ws.recv().
 
-async def ws_websockets_throughput(uri: str, payload_len: int, count: int, timeout_s: float = 5.0) -> float:
+    Sends and receives overlap, so the two totals can add up to more than the wall time; their
+    ratio shows whether the client is bound by encoding/writing or by waiting for echoes.
+    """
+    if websockets is None:
+        return float("nan"), 0, 0
+    payload = _as_payload(payload)
     try:
-        import websockets  # type: ignore
+        ws = await _websockets_conn(uri, timeout_s)
     except Exception:
-        return float("nan")
-    payload = b"A" * payload_len
+        return float("nan"), 0, 0
+    received = 0
+    send_ns = recv_ns = 0
+    clock = time.perf_counter_ns
     start = time.perf_counter()
-    try:
-        conn = await asyncio.wait_for(websockets.connect(uri, max_size=None), timeout=timeout_s)
-    except Exception:
-        return float("nan")
-    async with conn as ws:
+    # Keep up to `inflight` messages outstanding so the pipe never drains between round-trips
+    window = asyncio.Semaphore(max(1, inflight))
+
+    async def prod() -> None:
+        nonlocal send_ns
         for _ in range(count):
-            try:
-                await asyncio.wait_for(ws.send(payload), timeout=timeout_s)
-                await asyncio.wait_for(ws.recv(), timeout=timeout_s)
-            except Exception:
-                break
+            await window.acquire()
+            t0 = clock()
+            await ws.send(payload)
+            send_ns += clock() - t0
+
+    async def cons() -> None:
+        nonlocal received, recv_ns
+        for _ in range(count):
+            t0 = clock()
+            await ws.recv()
+            recv_ns += clock() - t0
+            received += 1
+            window.release()
+
+    await _run_guarded(asyncio.gather(prod(), cons(), return_exceptions=True), lambda: received, timeout_s)
     elapsed = time.perf_counter() - start
-    return count / elapsed if elapsed > 0 else float("inf")
+    if received < count:
+        await _discard_websockets_conn(uri)
+    return (received / elapsed if elapsed > 0 else float("inf")), send_ns, recv_ns
 
 
 async def ws_websockets_latency(uri: str, iters: int, timeout_s: float = 5.0) -> Tuple[float, float, float]:
-    try:
-        import websockets  # type: ignore
-    except Exception:
+    if websockets is None:
         return (float("nan"), float("nan"), float("nan"))
-    samples = []
     try:
-        conn = await asyncio.wait_for(websockets.connect(uri, max_size=None), timeout=timeout_s)
+        ws = await _websockets_conn(uri, timeout_s)
     except Exception:
         return (float("nan"), float("nan"), float("nan"))
-    async with conn as ws:
-        for _ in range(iters):
-            t0 = time.perf_counter()
-            try:
-                await asyncio.wait_for(ws.send(b"x"), timeout=timeout_s)
-                await asyncio.wait_for(ws.recv(), timeout=timeout_s)
-            except Exception:
-                break
-            t1 = time.perf_counter()
-            samples.append((t1 - t0) * 1000.0)
-    samples.sort()
-    n = len(samples)
-    def pct(p: float) -> float:
-        i = min(max(int(n * p), 0), n - 1) if n else 0
-        return samples[i] if n else float("nan")
-    return (pct(0.50), pct(0.90), pct(0.99))
-
-
-async def aiohttp_throughput(uri: str, payload_len: int, count: int, timeout_s: float = 5.0) -> float:
+    samples = _sample_buffer(iters)
+    done = 0
+
+    async def loop() -> None:
+        nonlocal done
+        clock = time.perf_counter_ns
+        for i in range(iters):
+            t0 = clock()
+            await ws.send(b"x")
+            await ws.recv()
+            samples[i] = clock() - t0
+            done = i + 1
+
+    await _run_guarded(asyncio.ensure_future(loop()), lambda: done, timeout_s)
+    if done < iters:
+        await _discard_websockets_conn(uri)
+    return _percentiles(samples[:done], 1e-6)
+
+
+async def aiohttp_throughput(uri: str, payload: Union[bytes, int], count: int, timeout_s: float = 5.0, inflight: int = 32) -> float:
     try:
         import aiohttp  # type: ignore
     except Exception:
         return float("nan")
-    payload = b"A" * payload_len
+    payload = _as_payload(payload)
     timeout = aiohttp.ClientTimeout(total=None, sock_read=timeout_s, sock_connect=timeout_s)
     start = time.perf_counter()
-    async with aiohttp.ClientSession(timeout=timeout) as session:
+    received = 0
+    connector = aiohttp.TCPConnector(resolver=_cached_resolver(aiohttp, uri))
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
         async with session.ws_connect(uri, timeout=timeout_s, autoping=True, protocols=()) as ws:
-            for _ in range(count):
-                await ws.send_bytes(payload)
-                msg = await ws.receive(timeout=timeout_s)
-                if msg.type != aiohttp.WSMsgType.BINARY and msg.type != aiohttp.WSMsgType.TEXT:
-                    break
+            _tune_connected(ws)
+            window = asyncio.Semaphore(max(1, inflight))
+
+            async def prod() -> None:
+                for _ in range(count):
+                    await asyncio.wait_for(window.acquire(), timeout=timeout_s)
+                    await ws.send_bytes(payload)
+
+            async def cons() -> None:
+                nonlocal received
+                for _ in range(count):
+                    msg = await ws.receive(timeout=timeout_s)
+                    if msg.type != aiohttp.WSMsgType.BINARY and msg.type != aiohttp.WSMsgType.TEXT:
+                        raise RuntimeError(f"unexpected message type {msg.type}")
+                    received += 1
+                    window.release()
+
+            await asyncio.gather(prod(), cons(), return_exceptions=True)
     elapsed = time.perf_counter() - start
-    return count / elapsed if elapsed > 0 else float("inf")
+    return received / elapsed if elapsed > 0 else float("inf")
 
 
 async def aiohttp_latency(uri: str, iters: int, timeout_s: float = 5.0) -> Tuple[float, float, float]:
@@ -128,59 +424,72 @@ async def aiohttp_latency(uri: str, iters: int, timeout_s: float = 5.0) -> Tuple
     except Exception:
         return (float("nan"), float("nan"), float("nan"))
     timeout = aiohttp.ClientTimeout(total=None, sock_read=timeout_s, sock_connect=timeout_s)
-    samples: List[float] = []
-    async with aiohttp.ClientSession(timeout=timeout) as session:
+    samples = _sample_buffer(iters)
+    done = 0
+    clock = time.perf_counter_ns
+    connector = aiohttp.TCPConnector(resolver=_cached_resolver(aiohttp, uri))
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
         async with session.ws_connect(uri, timeout=timeout_s, autoping=True, protocols=()) as ws:
-            for _ in range(iters):
-                t0 = time.perf_counter()
+            _tune_connected(ws)
+            for i in range(iters):
+                t0 = clock()
                 await ws.send_bytes(b"x")
                 msg = await ws.receive(timeout=timeout_s)
                 if msg.type == aiohttp.WSMsgType.CLOSED:
                     break
-                t1 = time.perf_counter()
-                samples.append((t1 - t0) * 1000.0)
-    samples.sort()
-    n = len(samples)
-    if not n:
-        return (float("nan"), float("nan"), float("nan"))
-    def pct(p: float) -> float:
-        i = min(max(int(n * p), 0), n - 1)
-        return samples[i]
-    return (pct(0.50), pct(0.90), pct(0.99))
+                samples[i] = clock() - t0
+                done = i + 1
+    return _percentiles(samples[:done], 1e-6)
 
 
-def ws_websocket_client_throughput(uri: str, payload_len: int, count: int, timeout_s: float = 5.0) -> float:
+def ws_websocket_client_throughput(uri: str, payload: Union[bytes, int], count: int, timeout_s: float = 5.0, inflight: int = 32) -> float:
     try:
         import websocket  # type: ignore
     except Exception:
         return float("nan")
-    payload = b"A" * payload_len
-    ws = websocket.create_connection(uri, timeout=timeout_s)
+    payload = _as_payload(payload)
+    ws = websocket.create_connection(uri, timeout=timeout_s, socket=_connect_sock(uri, timeout_s))
     ws.settimeout(timeout_s)
+    window = threading.Semaphore(max(1, inflight))
+    received = 0
+
+    def _drain() -> None:
+        nonlocal received
+        try:
+            for _ in range(count):
+                _ = ws.recv()
+                received += 1
+                window.release()
+        except Exception:
+            pass
+
+    reader = threading.Thread(target=_drain, daemon=True)
     start = time.perf_counter()
+    reader.start()
     try:
         for _ in range(count):
+            if not window.acquire(timeout=timeout_s):
+                break
             ws.send(payload, opcode=2)
-            _ = ws.recv()
     except Exception:
         pass
-    finally:
-        try:
-            ws.close()
-        except Exception:
-            pass
+    reader.join(timeout_s)
     elapsed = time.perf_counter() - start
-    return count / elapsed if elapsed > 0 else float("inf")
+    try:
+        ws.close()
+    except Exception:
+        pass
+    return received / elapsed if elapsed > 0 else float("inf")
 
 
-def websocat_throughput(uri: str, payload_len: int, count: int) -> float:
+def websocat_throughput(uri: str, payload: Union[bytes, int], count: int) -> float:
     """Use websocat to send newline-terminated payloads and await echo; approximate throughput."""
     websocat = shutil.which("websocat")
     if not websocat:
         return float("nan")
-    payload = ("A" * max(1, payload_len)).encode()
+    payload = _as_payload(payload) or b"A"
     try:
-        p = subprocess.Popen([websocat, "-t", uri], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=False, bufsize=0)
+        p = _spawn([websocat, "-t", uri], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=False)
     except Exception:
         return float("nan")
     start = time.perf_counter()
@@ -190,12 +499,9 @@ def websocat_throughput(uri: str, payload_len: int, count: int) -> float:
             line = payload + b"\n"
             p.stdin.write(line)
             p.stdin.flush()
-            out = b""
-            while not out.endswith(b"\n"):
-                ch = p.stdout.read(1)
-                if not ch:
-                    raise RuntimeError("websocat closed")
-                out += ch
+            out = p.stdout.readline()
+            if not out:
+                raise RuntimeError("websocat closed")
             ok += 1
     except Exception:
         pass
@@ -213,16 +519,18 @@ def ws_websocket_client_latency(uri: str, iters: int, timeout_s: float = 5.0) ->
         import websocket  # type: ignore
     except Exception:
         return (float("nan"), float("nan"), float("nan"))
-    ws = websocket.create_connection(uri, timeout=timeout_s)
+    ws = websocket.create_connection(uri, timeout=timeout_s, socket=_connect_sock(uri, timeout_s))
     ws.settimeout(timeout_s)
-    samples: List[float] = []
+    samples = _sample_buffer(iters)
+    done = 0
+    clock = time.perf_counter_ns
     try:
-        for _ in range(iters):
-            t0 = time.perf_counter()
+        for i in range(iters):
+            t0 = clock()
             ws.send(b"x", opcode=2)
             _ = ws.recv()
-            t1 = time.perf_counter()
-            samples.append((t1 - t0) * 1000.0)
+            samples[i] = clock() - t0
+            done = i + 1
     except Exception:
         pass
     finally:
@@ -230,14 +538,7 @@ def ws_websocket_client_latency(uri: str, iters: int, timeout_s: float = 5.0) ->
             ws.close()
         except Exception:
             pass
-    samples.sort()
-    n = len(samples)
-    if not n:
-        return (float("nan"), float("nan"), float("nan"))
-    def pct(p: float) -> float:
-        i = min(max(int(n * p), 0), n - 1)
-        return samples[i]
-    return (pct(0.50), pct(0.90), pct(0.99))
+    return _percentiles(samples[:done], 1e-6)
 
 
 def websocat_latency(uri: str, iters: int) -> Tuple[float, float, float]:
@@ -245,22 +546,21 @@ def websocat_latency(uri: str, iters: int) -> Tuple[float, float, float]:
     if not websocat:
         return (float("nan"), float("nan"), float("nan"))
     try:
-        p = subprocess.Popen([websocat, "-t", uri], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=False, bufsize=0)
+        p = _spawn([websocat, "-t", uri], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=False)
     except Exception:
         return (float("nan"), float("nan"), float("nan"))
-    samples: List[float] = []
+    samples = _sample_buffer(iters)
+    done = 0
+    clock = time.perf_counter_ns
     try:
-        for _ in range(iters):
-            t0 = time.perf_counter()
+        for i in range(iters):
+            t0 = clock()
             p.stdin.write(b"x\n"); p.stdin.flush()
-            out = b""
-            while not out.endswith(b"\n"):
-                ch = p.stdout.read(1)
-                if not ch:
-                    raise RuntimeError("websocat closed")
-                out += ch
-            t1 = time.perf_counter()
-            samples.append((t1 - t0) * 1000.0)
+            out = p.stdout.readline()
+            if not out:
+                raise RuntimeError("websocat closed")
+            samples[i] = clock() - t0
+            done = i + 1
     except Exception:
         pass
     finally:
@@ -268,66 +568,99 @@ def websocat_latency(uri: str, iters: int) -> Tuple[float, float, float]:
             p.terminate()
         except Exception:
             pass
-    samples.sort()
-    n = len(samples)
-    if not n:
-        return (float("nan"), float("nan"), float("nan"))
-    def pct(pv: float) -> float:
-        i = min(max(int(n * pv), 0), n - 1)
-        return samples[i]
-    return (pct(0.50), pct(0.90), pct(0.99))
+    return _percentiles(samples[:done], 1e-6)
 
 
 def lws_client_throughput(uri: str, payload_len: int, count: int) -> float:
     exe = os.path.join(BUILD, "bench_lws_client")
     if not os.path.exists(exe):
         return float("nan")
-    rc, out, err = run_cmd([exe, uri, str(payload_len), str(count)])
+    rc, last, err = run_cmd_last_line([exe, uri, str(payload_len), str(count)])
     if rc != 0:
         return float("nan")
-    for tok in out.split():
-        if tok.startswith("lws") and "msgs/s=" in tok:
-            try:
-                return float(tok.split("=", 1)[1])
-            except Exception:
-                return float("nan")
-    return float("nan")
+    m = _TPUT_RE.search(last)
+    return float(m.group(1)) if m else float("nan")
 
 
-def bench_ours_throughput(uri: str, payload_len: int, count: int) -> Optional[float]:
-    ensure_built()
-    exe = os.path.join(BUILD, "bench_throughput")
-    rc, out, err = run_cmd([exe, uri, str(payload_len), str(count)])
-    if rc != 0:
-        print(err or out, file=sys.stderr)
-        return None
-    try:
-        last = out.strip().splitlines()[-1]
-        parts = last.split()
-        for token in parts:
-            if token.startswith("msgs/s="):
-                return float(token.split("=", 1)[1])
-    except Exception:
-        pass
-    return None
+_bench_lib: Optional[ctypes.CDLL] = None
 
 
-def bench_ours_latency(uri: str, iters: int) -> Optional[Tuple[float, float, float]]:
-    ensure_built()
-    exe = os.path.join(BUILD, "bench_latency")
-    rc, out, err = run_cmd([exe, uri, str(iters)])
-    if rc != 0:
-        print(err or out, file=sys.stderr)
-        return None
+def _load_bench_lib() -> ctypes.CDLL:
+    """Load bench/bench_api.c's shared library once; our measurements run in-process through it."""
+    global _bench_lib
+    if _bench_lib is None:
+        lib = ctypes.CDLL(os.path.join(BUILD, BENCH_LIB))
+        lib.bench_throughput_run.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_size_t]
+        lib.bench_throughput_run.restype = ctypes.c_double
+        lib.bench_latency_run.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_double)]
+        lib.bench_latency_run.restype = ctypes.c_int
+        _bench_lib = lib
+    return _bench_lib
+
+
+def bench_ours_all(uri: str, sizes: List[int], count: int, iters: int) -> Dict[str, object]:
+    """Throughput for every size plus latency, measured in-process through the C bench API.
+
+    Returns ``{"throughput": {size: msgs/s}, "latency": (p50, p90, p99) or None}``; failed
+    measurements are left out.
+    """
+    tput: Dict[int, float] = {}
+    lat: Optional[Tuple[float, float, float]] = None
     try:
-        last = out.strip().splitlines()[-1]
-        tokens = last.replace(",", " ").replace("=", " ").split()
-        p50 = float(tokens[tokens.index("p50") + 1].rstrip("ms"))
-        p90 = float(tokens[tokens.index("p90") + 1].rstrip("ms"))
-        p99 = float(tokens[tokens.index("p99") + 1].rstrip("ms"))
-        return (p50, p90, p99)
-    except Exception:
-        return None
+        lib = _load_bench_lib()
+    except OSError as e:
+        print(e, file=sys.stderr)
+        return {"throughput": tput, "latency": lat}
+    c_uri = uri.encode()
+    for sz in sizes:
+        rate = lib.bench_throughput_run(c_uri, sz, count)
+        if rate >= 0:
+            tput[sz] = rate
+    out = (ctypes.c_double * 3)()
+    if lib.bench_latency_run(c_uri, iters, out) == 0:
+        lat = (out[0], out[1], out[2])
+    return {"throughput": tput, "latency": lat}
+
+
+def _echo_server_proc(host: str, ctrl, cpu: Optional[int]) -> None:
+    """Body of the auto-started echo server process.
+
+    Reports its port over ctrl (one end of a socketpair) and serves until the parent closes the
+    other end; EOF there resolves a stop future, so shutdown needs neither polling nor a signal.
+    """
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    # The server is shared infrastructure, not a competitor: always give it the fastest loop
+    # available, whatever --no-uvloop picks for the clients
+    try:
+        import uvloop  # type: ignore
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    async def echo(ws):
+        async for m in ws:
+            await ws.send(m)
+
+    async def runner():
+        loop = asyncio.get_running_loop()
+        # Tune the listener before listen(): accepted sockets inherit TCP_NODELAY and the buffer
+        # sizes, and the receive window scale is fixed at handshake time
+        lsock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+        lsock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        _tune_sock(lsock)
+        lsock.bind((host, 0))
+        lsock.listen(128)
+        server = await websockets.serve(echo, sock=lsock, max_size=None)
+        stop = loop.create_future()
+        loop.add_reader(ctrl.fileno(), lambda: stop.done() or stop.set_result(None))
+        ctrl.send(server.sockets[0].getsockname()[1])
+        await stop
+
+    # Not asyncio.run(): its shutdown waits on every connection handler, and one stuck sending to a
+    # client that never reads its echoes holds exit up for the full close timeout. Process exit
+    # closes the sockets anyway.
+    asyncio.new_event_loop().run_until_complete(runner())
 
 
 def main() -> None:
@@ -336,16 +669,30 @@ def main() -> None:
     ap.add_argument("--sizes", nargs="*", type=int, default=[125, 16 * 1024, 64 * 1024], help="payload sizes for throughput")
     ap.add_argument("--count", type=int, default=50000, help="messages per size for throughput")
     ap.add_argument("--iters", type=int, default=2000, help="iterations for latency")
+    ap.add_argument("--inflight", type=int, default=32, help="max in-flight messages per connection for Python throughput")
     ap.add_argument("--install-missing", action="store_true", help="attempt to pip install missing python competitors in this interpreter")
+    ap.add_argument("--parallel", action="store_true", help="overlap Python competitor throughput benches (faster, but they contend for the GIL and the echo server, so rates drop)")
+    ap.add_argument("--no-uvloop", action="store_true", help="run async competitors on the stdlib asyncio loop instead of uvloop")
     args = ap.parse_args()
     if not args.uri:
         print("Provide URI via arg or WIBESOCKET_BENCH_URI", file=sys.stderr)
         sys.exit(2)
+    ensure_built()
+
+    # Compare against the fastest available Python event loop; every loop _run() creates picks it up
+    loop_name = "asyncio"
+    if not args.no_uvloop:
+        if args.install_missing:
+            ensure_python_package("uvloop", "uvloop")
+        try:
+            import uvloop  # type: ignore
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            loop_name = "uvloop"
+        except ImportError:
+            pass
 
     # Auto-start a local echo server if URI targets localhost and 'websockets' is available
     echo_proc = None
-    echo_thread = None
-    echo_stop = None
     try:
         parsed = urllib.parse.urlsplit(args.uri)
         host = parsed.hostname or ""
@@ -354,101 +701,99 @@ def main() -> None:
             try:
                 if args.install_missing:
                     ensure_python_package("websockets", "websockets")
-                import websockets  # type: ignore
-                import threading, queue
+                if websockets is None:
+                    raise ImportError("websockets")  # fail early if the child can't serve
                 addr_host = host if host != "localhost" else "127.0.0.1"
-                port_q: "queue.Queue[int]" = queue.Queue(maxsize=1)
-                stop_ev = threading.Event()
-
-                def _run_server():
-                    import asyncio as _aio
-                    async def echo(ws):
-                        async for m in ws:
-                            await ws.send(m)
-                    async def runner():
-                        server = await websockets.serve(echo, addr_host, 0, max_size=None)
-                        sel_port = server.sockets[0].getsockname()[1]
-                        port_q.put(sel_port)
-                        try:
-                            while not stop_ev.is_set():
-                                await _aio.sleep(0.1)
-                        finally:
-                            server.close()
-                            await server.wait_closed()
-                    _aio.run(runner())
-
-                t = threading.Thread(target=_run_server, daemon=True)
-                t.start()
+                # Separate process, not a thread and not our own loop: the server must never contend for
+                # our GIL, and our in-process C benches and the sync clients block their calling thread,
+                # so a server sharing that thread or loop would stall (or deadlock) under them
+                ctx = multiprocessing.get_context("spawn")
+                echo_ctrl, child_ctrl = ctx.Pipe()  # socketpair: port handoff, then EOF means stop
+                cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+                server_cpu = cpus[0] if len(cpus) >= 2 else None
+                proc = ctx.Process(target=_echo_server_proc, args=(addr_host, child_ctrl, server_cpu), daemon=True)
+                proc.start()
+                child_ctrl.close()
                 try:
-                    sel_port = port_q.get(timeout=5.0)
-                    args.uri = f"ws://{addr_host}:{sel_port}/"
-                    echo_thread = t
-                    echo_stop = stop_ev
+                    if not echo_ctrl.poll(5.0):
+                        raise TimeoutError
+                    sel_port = echo_ctrl.recv()
+                    netloc = f"[{addr_host}]" if ":" in addr_host else addr_host
+                    args.uri = f"ws://{netloc}:{sel_port}/"
+                    echo_proc = proc
+                    if server_cpu is not None:
+                        # Keep clients off the server's core
+                        os.sched_setaffinity(0, set(cpus[1:]))
                 except Exception:
+                    echo_ctrl.close()
+                    proc.terminate()
                     print("Warning: local echo server failed to start within timeout", file=sys.stderr)
             except Exception:
                 print("Note: couldn't auto-start local echo server (install 'websockets' in this interpreter)", file=sys.stderr)
     except Exception:
         pass
 
+    # Resolve once up front; every competitor connection reuses the cached address
+    try:
+        _resolve(args.uri)
+    except OSError as e:
+        print(f"Warning: could not resolve {args.uri}: {e}", file=sys.stderr)
     print(f"URI: {args.uri}")
-    results: Dict[str, Dict] = {"uri": args.uri, "throughput": {}, "latency": {}}
+    print(f"Event loop: {loop_name}")
+    results: Dict[str, Dict] = {"uri": args.uri, "event_loop": loop_name, "throughput": {}, "latency": {}}
     print("== Throughput (round-trip msgs/s) ==")
+    # One at a time by default: overlapped competitors share our GIL and the single-core echo server,
+    # so their rates would measure that contention rather than the client
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=4) if args.parallel else None
+    ours_all = bench_ours_all(args.uri, args.sizes, args.count, args.iters)
     for sz in args.sizes:
-        ours = bench_ours_throughput(args.uri, sz, args.count)
+        payload = _payload(sz)
+        ours = ours_all["throughput"].get(sz)
         print(f" ours  sz={sz:6d}: {ours:.2f} msgs/s" if ours else f" ours  sz={sz:6d}: n/a")
-        # Python websockets
         if args.install_missing:
             ensure_python_package("websockets", "websockets")
-        try:
-            t = asyncio.run(ws_websockets_throughput(args.uri, sz, min(args.count, 20000)))
-            print(f" websockets sz={sz:6d}: {t:.2f} msgs/s")
-        except Exception as e:
-            print(f" websockets sz={sz:6d}: n/a ({e})")
-            t = None
-        # Python websocket-client (sync)
-        if args.install_missing:
             ensure_python_package("websocket", "websocket-client")
-        tc = ws_websocket_client_throughput(args.uri, sz, min(args.count, 20000))
-        if tc == tc:  # not NaN
-            print(f" websocket-client sz={sz:6d}: {tc:.2f} msgs/s")
-        else:
-            print(f" websocket-client sz={sz:6d}: n/a")
-        # aiohttp (async)
-        if args.install_missing:
             ensure_python_package("aiohttp", "aiohttp")
-        try:
-            ta = asyncio.run(aiohttp_throughput(args.uri, sz, min(args.count, 20000)))
-            if ta == ta:
-                print(f" aiohttp sz={sz:6d}: {ta:.2f} msgs/s")
-            else:
-                print(f" aiohttp sz={sz:6d}: n/a")
-        except Exception:
-            ta = float("nan")
-            print(f" aiohttp sz={sz:6d}: n/a")
-        # websocat (cli)
-        tw = websocat_throughput(args.uri, sz, min(args.count, 20000))
-        if tw == tw:
-            print(f" websocat sz={sz:6d}: {tw:.2f} msgs/s")
+        n = min(args.count, 20000)
+        ws_split: Dict[str, int] = {}
+
+        def ws_tput() -> float:
+            rate, ws_split["send_ns"], ws_split["recv_ns"] = _run(ws_websockets_throughput(args.uri, payload, n, inflight=args.inflight))
+            return rate
+
+        # Each competitor uses its own connection (and its own event loop for the async ones)
+        runs = [
+            ws_tput,
+            lambda: ws_websocket_client_throughput(args.uri, payload, n, inflight=args.inflight),
+            lambda: _run(aiohttp_throughput(args.uri, payload, n, inflight=args.inflight)),
+            lambda: websocat_throughput(args.uri, payload, n),
+            lambda: lws_client_throughput(args.uri, sz, n),
+        ]
+        if pool is None:
+            rates = [_guarded(fn) for fn in runs]
         else:
-            print(f" websocat sz={sz:6d}: n/a")
-        # libwebsockets C client (optional)
-        tlws = lws_client_throughput(args.uri, sz, min(args.count, 20000))
-        if tlws == tlws:
-            print(f" libwebsockets sz={sz:6d}: {tlws:.2f} msgs/s")
-        else:
-            print(f" libwebsockets sz={sz:6d}: n/a")
+            rates = list(pool.map(_guarded, runs))
+        for name, rate in zip(("websockets", "websocket-client", "aiohttp", "websocat", "libwebsockets"), rates):
+            print(f" {name} sz={sz:6d}: {rate:.2f} msgs/s" if rate == rate else f" {name} sz={sz:6d}: n/a")
+        t, tc, ta, tw, tlws = rates
+        if t == t and ws_split:
+            print(f"   websockets send={ws_split['send_ns'] / 1e6:.1f}ms recv={ws_split['recv_ns'] / 1e6:.1f}ms")
         results["throughput"][str(sz)] = {
             "ours_msgs_per_sec": float(ours) if ours else None,
-            "websockets_msgs_per_sec": float(t) if t else None,
+            "websockets_msgs_per_sec": float(t) if t == t else None,
             "websocket_client_msgs_per_sec": float(tc) if tc == tc else None,
             "aiohttp_msgs_per_sec": float(ta) if ta == ta else None,
             "websocat_msgs_per_sec": float(tw) if tw == tw else None,
             "libwebsockets_msgs_per_sec": float(tlws) if tlws == tlws else None,
+            "websockets_send_ns": ws_split.get("send_ns") if t == t else None,
+            "websockets_recv_ns": ws_split.get("recv_ns") if t == t else None,
         }
 
+    if pool is not None:
+        pool.shutdown()
+
     print("\n== Latency (ms) ==")
-    ol = bench_ours_latency(args.uri, args.iters)
+    ol = ours_all["latency"]
     if ol:
         print(f" ours: p50={ol[0]:.3f} p90={ol[1]:.3f} p99={ol[2]:.3f}")
     if args.install_missing:
@@ -456,7 +801,7 @@ def main() -> None:
         ensure_python_package("websocket", "websocket-client")
         ensure_python_package("aiohttp", "aiohttp")
     try:
-        p50, p90, p99 = asyncio.run(ws_websockets_latency(args.uri, args.iters))
+        p50, p90, p99 = _run(ws_websockets_latency(args.uri, args.iters))
         print(f" websockets: p50={p50:.3f} p90={p90:.3f} p99={p99:.3f}")
     except Exception as e:
         print(f" websockets: n/a ({e})")
@@ -470,7 +815,7 @@ def main() -> None:
     except Exception:
         cp50 = cp90 = cp99 = None
     try:
-        ap50, ap90, ap99 = asyncio.run(aiohttp_latency(args.uri, args.iters))
+        ap50, ap90, ap99 = _run(aiohttp_latency(args.uri, args.iters))
         if ap50 == ap50:
             print(f" aiohttp: p50={ap50:.3f} p90={ap90:.3f} p99={ap99:.3f}")
         else:
@@ -506,6 +851,8 @@ def main() -> None:
                                                "p90": (float(swp90) if swp90 == swp90 else None),
                                                "p99": (float(swp99) if swp99 == swp99 else None)}
 
+    _close_loops()
+
     print("\nTip: install 'websockets' for Python comparison: pip install websockets")
 
     # Persist JSON and Markdown summary in bench/
@@ -513,51 +860,59 @@ def main() -> None:
     os.makedirs(out_dir, exist_ok=True)
     json_path = os.path.join(out_dir, "latest.json")
     with open(json_path, "w") as f:
-        json.dump(results, f, indent=2)
-
-    md_lines = []
-    md_lines.append(f"# WibeSocket Benchmarks\n\nURI: `{results['uri']}`\n")
-    md_lines.append("## Throughput (msgs/s)\n")
-    md_lines.append("| Size | Ours | websockets | websocket-client | aiohttp | websocat | libwebsockets |\n|---:|---:|---:|---:|---:|---:|---:|")
-    for sz in args.sizes:
-        row = results["throughput"].get(str(sz), {})
-        ours_v = row.get("ours_msgs_per_sec")
-        ws_v = row.get("websockets_msgs_per_sec")
-        wsc_v = row.get("websocket_client_msgs_per_sec")
-        aio_v = row.get("aiohttp_msgs_per_sec")
-        wc_v = row.get("websocat_msgs_per_sec")
-        lws_v = row.get("libwebsockets_msgs_per_sec")
-        md_lines.append(f"| {sz} | {ours_v if ours_v is not None else 'n/a'} | {ws_v if ws_v is not None else 'n/a'} | {wsc_v if wsc_v is not None else 'n/a'} | {aio_v if aio_v is not None else 'n/a'} | {wc_v if wc_v is not None else 'n/a'} | {lws_v if lws_v is not None else 'n/a'} |")
-    md_lines.append("\n## Latency (ms)\n")
+        json.dump(results, f, separators=(",", ":"))
+
+    def na(v: object) -> object:
+        return "n/a" if v is None else v
+
+    def ns_to_ms(v: Optional[int]) -> Optional[float]:
+        return None if v is None else round(v / 1e6, 3)
+
+    tput_keys = ("ours", "websockets", "websocket_client", "aiohttp", "websocat", "libwebsockets")
+    tput_rows = "\n".join(
+        f"| {sz} | " + " | ".join(str(na(results["throughput"].get(str(sz), {}).get(f"{k}_msgs_per_sec"))) for k in tput_keys) + " |"
+        for sz in args.sizes
+    )
+    split_rows = "\n".join(
+        f"| {sz} | {na(ns_to_ms(results['throughput'].get(str(sz), {}).get('websockets_send_ns')))} | "
+        f"{na(ns_to_ms(results['throughput'].get(str(sz), {}).get('websockets_recv_ns')))} |"
+        for sz in args.sizes
+    )
     lm = results["latency"]
-    md_lines.append("| Impl | p50 | p90 | p99 |\n|:--|--:|--:|--:|")
-    om = lm.get("ours_ms", {})
-    wm = lm.get("websockets_ms", {})
-    md_lines.append(f"| Ours | {om.get('p50','n/a')} | {om.get('p90','n/a')} | {om.get('p99','n/a')} |")
-    md_lines.append(f"| websockets | {wm.get('p50','n/a')} | {wm.get('p90','n/a')} | {wm.get('p99','n/a')} |")
-    wcm = lm.get("websocket_client_ms", {})
-    md_lines.append(f"| websocket-client | {wcm.get('p50','n/a')} | {wcm.get('p90','n/a')} | {wcm.get('p99','n/a')} |")
-    am = lm.get("aiohttp_ms", {})
-    md_lines.append(f"| aiohttp | {am.get('p50','n/a')} | {am.get('p90','n/a')} | {am.get('p99','n/a')} |")
-    # include websocat if available (latency)
-    j = os.path.join(out_dir, "latest.json")
-    wsm = results["latency"].get("websocat_ms", {}) if "websocat_ms" in results["latency"] else {}
-    if wsm:
-        md_lines.append(f"| websocat | {wsm.get('p50','n/a')} | {wsm.get('p90','n/a')} | {wsm.get('p99','n/a')} |")
-    md_lines.append("\n")
+    lat_impls = [("Ours", "ours_ms"), ("websockets", "websockets_ms"), ("websocket-client", "websocket_client_ms"), ("aiohttp", "aiohttp_ms")]
+    # include websocat only if it was measured
+    if lm.get("websocat_ms"):
+        lat_impls.append(("websocat", "websocat_ms"))
+    lat_rows = "\n".join(
+        f"| {name} | {na(lm.get(key, {}).get('p50'))} | {na(lm.get(key, {}).get('p90'))} | {na(lm.get(key, {}).get('p99'))} |"
+        for name, key in lat_impls
+    )
     md_path = os.path.join(ROOT, "bench", "RESULTS.md")
     with open(md_path, "w") as f:
-        f.write("\n".join(md_lines) + "\n")
+        f.write(
+            f"# WibeSocket Benchmarks\n\nURI: `{results['uri']}`\n\n"
+            "## Throughput (msgs/s)\n\n"
+            "| Size | Ours | websockets | websocket-client | aiohttp | websocat | libwebsockets |\n|---:|---:|---:|---:|---:|---:|---:|\n"
+            f"{tput_rows}\n\n"
+            "### websockets send/recv split (ms awaited)\n\n"
+            "| Size | send | recv |\n|---:|---:|---:|\n"
+            f"{split_rows}\n\n"
+            "## Latency (ms)\n\n"
+            "| Impl | p50 | p90 | p99 |\n|:--|--:|--:|--:|\n"
+            f"{lat_rows}\n\n\n"
+        )
     print(f"\nSaved: {json_path}\nSaved: {md_path}")
 
     # Tear down local echo server if we started one
     if echo_proc is not None:
         try:
-            echo_proc.terminate()
+            echo_ctrl.close()  # the server sees EOF and shuts down cleanly
+            echo_proc.join(timeout=5.0)
+            if echo_proc.is_alive():
+                echo_proc.terminate()
+                echo_proc.join(timeout=5.0)
         except Exception:
             pass
-    if echo_stop is not None:
-        echo_stop.set()
 
 if __name__ == "__main__":
     main()
@@ -8,29 +8,18 @@ async def main():
         raise RuntimeError("connect failed")
 
     loop = asyncio.get_running_loop()
-    fd = wibesocket.fileno(conn)
-    recv_fut = loop.create_future()
-
-    def on_readable():
-        # Try to receive without blocking (short timeout)
-        res = wibesocket.recv(conn, timeout_ms=0)
-        if res is None:
-            return
-        ftype, data, is_final = res
-        if not recv_fut.done():
-            recv_fut.set_result((ftype, data, is_final))
-
-    loop.add_reader(fd, on_readable)
+    frames = asyncio.Queue()
+    # The reader lives in C: it drains whole frames on each wakeup and calls back once per
+    # frame. The payload view is only valid during the callback, so copy what you keep.
+    wibesocket.attach_to_loop(conn, loop, lambda f: frames.put_nowait((f[0], f[1].tobytes(), f[2])))
 
     assert wibesocket.send_text(conn, "hello from asyncio")
     try:
-        ftype, data, is_final = await asyncio.wait_for(recv_fut, timeout=3.0)
-        print("recv:", ftype, data.tobytes().decode('utf-8', 'ignore'), is_final)
+        ftype, data, is_final = await asyncio.wait_for(frames.get(), timeout=3.0)
+        print("recv:", ftype, data.decode('utf-8', 'ignore'), is_final)
     finally:
-        loop.remove_reader(fd)
+        loop.remove_reader(wibesocket.fileno(conn))
         wibesocket.close(conn)
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-
@@ -49,6 +49,9 @@ typedef struct {
     uint32_t    handshake_timeout_ms;
     uint32_t    max_frame_size;
     bool        enable_compression;
+    /* SO_BUSY_POLL budget in microseconds (0 = off). Trades CPU for latency: reads spin on the
+     * device queue instead of sleeping, which pays off for a few hot sockets, not many idle ones. */
+    uint32_t    busy_poll_us;
 } wibesocket_config_t;
 
 typedef struct {
@@ -56,6 +59,8 @@ typedef struct {
     const void*             payload;
     size_t                  payload_len;
     bool                    is_final;
+    /* Set by recv: pin slot holding payload, for wibesocket_release_slot */
+    uint32_t                slot;
 } wibesocket_message_t;
 
 typedef enum {
@@ -74,17 +79,34 @@ typedef enum {
 wibesocket_conn_t* wibesocket_connect(const char* uri, const wibesocket_config_t* config);
 wibesocket_error_t wibesocket_send_text(wibesocket_conn_t* conn, const char* text, size_t len);
 wibesocket_error_t wibesocket_send_binary(wibesocket_conn_t* conn, const void* data, size_t len);
+/* Send several TEXT/BINARY messages as one write per ~256 KiB of frames; msgs[i].is_final is
+ * ignored. *sent (optional) receives how many messages were handed to the socket or send queue.
+ */
+wibesocket_error_t wibesocket_send_many(wibesocket_conn_t* conn, const wibesocket_message_t* msgs, size_t count, size_t* sent);
 wibesocket_error_t wibesocket_send_ping(wibesocket_conn_t* conn, const void* data, size_t len);
 wibesocket_error_t wibesocket_send_close(wibesocket_conn_t* conn, uint16_t code, const char* reason);
+/* Receive the next data frame or PONG. PINGs are answered inline and never returned;
+ * a CLOSE completes the close handshake and yields WIBESOCKET_ERROR_CLOSED.
+ */
 wibesocket_error_t wibesocket_recv(wibesocket_conn_t* conn, wibesocket_message_t* msg, int timeout_ms);
+/* Receive like wibesocket_recv, then also take every complete data frame already buffered behind
+ * it, up to max. All payloads share msgs[0].slot and stay pinned until that slot is released.
+ * *count receives the number of messages filled in.
+ */
+wibesocket_error_t wibesocket_recv_batch(wibesocket_conn_t* conn, wibesocket_message_t* msgs, size_t max, int timeout_ms, size_t* count);
 wibesocket_state_t wibesocket_get_state(const wibesocket_conn_t* conn);
 wibesocket_error_t wibesocket_get_error(const wibesocket_conn_t* conn);
 wibesocket_error_t wibesocket_close(wibesocket_conn_t* conn);
 const char*        wibesocket_error_string(wibesocket_error_t error);
 
-/* Advanced: zero-copy payload lifetime management for FFI bindings */
+/* Advanced: zero-copy payload lifetime management for FFI bindings.
+ * Each received payload stays pinned in the recv buffer until its slot is released; up to 16
+ * can be held at once, after which recv returns NOT_READY. retain/release_payload act on the
+ * most recently received payload still held.
+ */
 void               wibesocket_retain_payload(wibesocket_conn_t* conn);
 void               wibesocket_release_payload(wibesocket_conn_t* conn);
+void               wibesocket_release_slot(wibesocket_conn_t* conn, uint32_t slot);
 
 /* File descriptor access for event loop integration */
 int                wibesocket_fileno(const wibesocket_conn_t* conn);
@@ -5,14 +5,20 @@ available (e.g., during documentation builds), the import is gracefully
 skipped and Python stubs are provided so that imports succeed.
 """
 
-from .wrappers import WebSocket, AsyncWebSocket, Frame, FrameType
-
 try:
     from ._core import (
         connect,
         send_text,
         send_binary,
         recv,
+        recv_until,
+        recv_message,
+        recv_future,
+        attach_to_loop,
+        send_many,
+        send_text_bulk,
+        recv_bulk,
+        recv_batch,
         release_payload,
         fileno,
         send_close,
@@ -29,16 +35,35 @@ except Exception as _e:  # pragma: no cover - used only during docs/import fallb
     send_text = _stub
     send_binary = _stub
     recv = _stub
+    recv_until = _stub
+    recv_message = _stub
+    recv_future = _stub
+    attach_to_loop = _stub
+    send_many = _stub
+    send_text_bulk = _stub
+    recv_bulk = _stub
+    recv_batch = _stub
     release_payload = _stub
     fileno = _stub
     send_close = _stub
     close = _stub
 
+# After _core: the wrappers bind its functions at import time
+from .wrappers import WebSocket, AsyncWebSocket, Frame, FrameType
+
 __all__ = [
     "connect",
     "send_text",
     "send_binary",
     "recv",
+    "recv_until",
+    "recv_message",
+    "recv_future",
+    "attach_to_loop",
+    "send_many",
+    "send_text_bulk",
+    "recv_bulk",
+    "recv_batch",
     "release_payload",
     "fileno",
     "send_close",
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from . import wibesocket_wrappers as _impl  # local module
+import wibesocket_wrappers as _impl  # top-level py_module, see setup.py
 
 AsyncWebSocket = _impl.AsyncWebSocket
 WebSocket = _impl.WebSocket
+Frame = _impl.Frame
+FrameType = _impl.FrameType
 WebSocketError = Exception  # placeholder alias
 
-__all__ = ["AsyncWebSocket", "WebSocket", "WebSocketError"]
+__all__ = ["AsyncWebSocket", "WebSocket", "Frame", "FrameType", "WebSocketError"]
@@ -1,6 +1,8 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <structmember.h>
+#include <string.h>
+#include <time.h>
 
 #include "wibesocket/wibesocket.h"
 
@@ -16,15 +18,16 @@ static wibesocket_conn_t* get_conn(PyObject* capsule) {
 
 static PyObject* py_connect(PyObject* self, PyObject* args, PyObject* kwargs) {
     const char* uri = NULL;
-    static char* kwlist[] = {"uri", "handshake_timeout_ms", "max_frame_size", "user_agent", "origin", "protocol", NULL};
+    static char* kwlist[] = {"uri", "handshake_timeout_ms", "max_frame_size", "user_agent", "origin", "protocol", "busy_poll_us", NULL};
     int handshake_timeout_ms = 5000;
     unsigned long max_frame_size = 1UL << 20;
     const char* user_agent = NULL;
     const char* origin = NULL;
     const char* protocol = NULL;
-    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|i$kzzz", kwlist,
+    unsigned int busy_poll_us = 0;
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "s|i$kzzzI", kwlist,
                                      &uri, &handshake_timeout_ms, &max_frame_size,
-                                     &user_agent, &origin, &protocol)) {
+                                     &user_agent, &origin, &protocol, &busy_poll_us)) {
         return NULL;
     }
     wibesocket_config_t cfg; memset(&cfg, 0, sizeof(cfg));
@@ -33,6 +36,7 @@ static PyObject* py_connect(PyObject* self, PyObject* args, PyObject* kwargs) {
     cfg.user_agent = user_agent;
     cfg.origin = origin;
     cfg.protocol = protocol;
+    cfg.busy_poll_us = (uint32_t)busy_poll_us;
     wibesocket_conn_t* c = wibesocket_connect(uri, &cfg);
     if (!c) Py_RETURN_NONE;
     return PyCapsule_New((void*)c, CONN_CAPSULE_NAME, conn_capsule_destructor);
@@ -44,23 +48,25 @@ static PyObject* py_send_text(PyObject* self, PyObject* args) {
     wibesocket_conn_t* c = get_conn(capsule);
     if (!c) Py_RETURN_FALSE;
     if (PyUnicode_Check(obj)) {
-        PyObject* utf8 = PyUnicode_AsUTF8String(obj);
-        if (!utf8) return NULL;
-        char* data = PyBytes_AsString(utf8);
-        Py_ssize_t len = PyBytes_Size(utf8);
-        wibesocket_error_t e = wibesocket_send_text(c, data, (size_t)len);
-        Py_DECREF(utf8);
-        if (e != WIBESOCKET_OK) Py_RETURN_FALSE;
-        Py_RETURN_TRUE;
-    } else if (PyBytes_Check(obj)) {
-        char* data = NULL; Py_ssize_t len = 0;
-        if (PyBytes_AsStringAndSize(obj, &data, &len) < 0) return NULL;
+        /* Borrowed UTF-8 view, valid for this call only: ASCII strs expose their own storage,
+           others cache it on the str */
+        Py_ssize_t len = 0;
+        const char* data = PyUnicode_AsUTF8AndSize(obj, &len);
+        if (!data) return NULL;
         wibesocket_error_t e = wibesocket_send_text(c, data, (size_t)len);
         if (e != WIBESOCKET_OK) Py_RETURN_FALSE;
         Py_RETURN_TRUE;
     }
-    PyErr_SetString(PyExc_TypeError, "send_text expects str or bytes");
-    return NULL;
+    /* Already-encoded UTF-8 in any bytes-like object, framed straight from its buffer */
+    Py_buffer view;
+    if (PyObject_GetBuffer(obj, &view, PyBUF_SIMPLE) < 0) {
+        PyErr_SetString(PyExc_TypeError, "send_text expects str or a bytes-like object");
+        return NULL;
+    }
+    wibesocket_error_t e = wibesocket_send_text(c, (const char*)view.buf, (size_t)view.len);
+    PyBuffer_Release(&view);
+    if (e != WIBESOCKET_OK) Py_RETURN_FALSE;
+    Py_RETURN_TRUE;
 }
 
 static PyObject* py_send_binary(PyObject* self, PyObject* args) {
@@ -74,24 +80,472 @@ static PyObject* py_send_binary(PyObject* self, PyObject* args) {
     Py_RETURN_TRUE;
 }
 
+/* One frame as (type, memoryview, is_final, slot), or None when nothing is ready yet.
+   Zero-copy: the memoryview points into the C buffer; caller must call release_payload(conn, slot).
+   wibesocket_recv already pinned it once, which is the reference that release drops. */
+static PyObject* frame_tuple(wibesocket_conn_t* c, const wibesocket_message_t* msg, uint32_t* slot);
+
+static PyObject* recv_frame(wibesocket_conn_t* c, int timeout_ms, uint32_t* slot) {
+    wibesocket_message_t msg; memset(&msg, 0, sizeof(msg));
+    wibesocket_error_t e = wibesocket_recv(c, &msg, timeout_ms);
+    if (e == WIBESOCKET_ERROR_TIMEOUT || e == WIBESOCKET_ERROR_NOT_READY) Py_RETURN_NONE;
+    if (e != WIBESOCKET_OK) {
+        PyErr_SetString(PyExc_RuntimeError, wibesocket_error_string(e));
+        return NULL;
+    }
+    return frame_tuple(c, &msg, slot);
+}
+
+/* (type, memoryview, is_final, slot) for a message wibesocket_recv just pinned; unpins it on failure */
+static PyObject* frame_tuple(wibesocket_conn_t* c, const wibesocket_message_t* msg, uint32_t* slot) {
+    PyObject* mem = PyMemoryView_FromMemory((char*)msg->payload, (Py_ssize_t)msg->payload_len, PyBUF_READ);
+    if (!mem) { wibesocket_release_slot(c, msg->slot); return NULL; }
+    PyObject* res = Py_BuildValue("iNNk", (int)msg->type, mem, PyBool_FromLong(msg->is_final), (unsigned long)msg->slot);
+    if (!res) { wibesocket_release_slot(c, msg->slot); return NULL; }
+    if (slot) *slot = msg->slot;
+    return res;
+}
+
 static PyObject* py_recv(PyObject* self, PyObject* args, PyObject* kwargs) {
     PyObject* capsule; int timeout_ms = 1000;
     static char* kwlist[] = {"conn", "timeout_ms", NULL};
     if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|i", kwlist, &capsule, &timeout_ms)) return NULL;
     wibesocket_conn_t* c = get_conn(capsule);
     if (!c) Py_RETURN_NONE;
-    wibesocket_message_t msg; memset(&msg, 0, sizeof(msg));
-    wibesocket_error_t e = wibesocket_recv(c, &msg, timeout_ms);
+    return recv_frame(c, timeout_ms, NULL);
+}
+
+static uint64_t monotonic_ms(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000u + (uint64_t)ts.tv_nsec / 1000000u;
+}
+
+/* Like recv, but skips frames whose payload lacks pattern. The whole wait runs in C; frames
+   that don't match are released as they arrive. timeout_ms < 0 waits forever. */
+static PyObject* py_recv_until(PyObject* self, PyObject* args, PyObject* kwargs) {
+    PyObject* capsule; Py_buffer pat; int timeout_ms = 1000;
+    static char* kwlist[] = {"conn", "pattern", "timeout_ms", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "Oy*|i", kwlist, &capsule, &pat, &timeout_ms)) return NULL;
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c) { PyBuffer_Release(&pat); Py_RETURN_NONE; }
+    wibesocket_message_t msg;
+    wibesocket_error_t e;
+    uint64_t deadline = monotonic_ms() + (uint64_t)(timeout_ms > 0 ? timeout_ms : 0);
+    for (;;) {
+        uint64_t now = monotonic_ms();
+        int left = timeout_ms < 0 ? -1 : now < deadline ? (int)(deadline - now) : 0;
+        memset(&msg, 0, sizeof(msg));
+        e = wibesocket_recv(c, &msg, left);
+        if (e != WIBESOCKET_OK) break;
+        if (msg.payload_len >= (size_t)pat.len &&
+            (pat.len == 0 || memmem(msg.payload, msg.payload_len, pat.buf, (size_t)pat.len))) break;
+        /* Past the deadline this keeps going only through frames already readable */
+        wibesocket_release_slot(c, msg.slot);
+    }
+    PyBuffer_Release(&pat);
     if (e == WIBESOCKET_ERROR_TIMEOUT || e == WIBESOCKET_ERROR_NOT_READY) Py_RETURN_NONE;
     if (e != WIBESOCKET_OK) {
         PyErr_SetString(PyExc_RuntimeError, wibesocket_error_string(e));
         return NULL;
     }
-    /* Zero-copy: create memoryview over the payload; caller must call release_payload(conn) */
-    wibesocket_retain_payload(c);
-    PyObject* mem = PyMemoryView_FromMemory((char*)msg.payload, (Py_ssize_t)msg.payload_len, PyBUF_READ);
-    if (!mem) { wibesocket_release_payload(c); return NULL; }
-    return Py_BuildValue("iNi", (int)msg.type, mem, (int)msg.is_final);
+    return frame_tuple(c, &msg, NULL);
+}
+
+/* One whole message as (type, bytes), or None if nothing arrives in time. Fragments are copied
+   into one buffer that starts at min(max_bytes, 64 KiB) and doubles, but never past max_bytes;
+   a longer message closes the connection with 1009. */
+static PyObject* py_recv_message(PyObject* self, PyObject* args, PyObject* kwargs) {
+    PyObject* capsule; Py_ssize_t max_bytes = 1 << 20; int timeout_ms = 1000;
+    static char* kwlist[] = {"conn", "max_bytes", "timeout_ms", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|ni", kwlist, &capsule, &max_bytes, &timeout_ms)) return NULL;
+    if (max_bytes < 0) {
+        PyErr_SetString(PyExc_ValueError, "max_bytes must be >= 0");
+        return NULL;
+    }
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c) Py_RETURN_NONE;
+    size_t limit = (size_t)max_bytes;
+    char* buf = NULL; size_t len = 0, cap = 0;
+    int type = -1, too_large = 0, oom = 0;
+    wibesocket_error_t e;
+    uint64_t deadline = monotonic_ms() + (uint64_t)(timeout_ms > 0 ? timeout_ms : 0);
+    for (;;) {
+        uint64_t now = monotonic_ms();
+        int left = timeout_ms < 0 ? -1 : now < deadline ? (int)(deadline - now) : 0;
+        wibesocket_message_t msg; memset(&msg, 0, sizeof(msg));
+        e = wibesocket_recv(c, &msg, left);
+        if (e != WIBESOCKET_OK) break;
+        /* PONGs may arrive between fragments; they aren't part of the message */
+        if (msg.type == WIBESOCKET_FRAME_PONG) { wibesocket_release_slot(c, msg.slot); continue; }
+        if (type < 0) type = (int)msg.type;
+        if (msg.payload_len > limit - len) {
+            wibesocket_release_slot(c, msg.slot);
+            too_large = 1;
+            break;
+        }
+        if (len + msg.payload_len > cap) {
+            size_t ncap = cap ? cap : (limit < 65536 ? limit : 65536);
+            while (ncap < len + msg.payload_len) ncap = (ncap > limit / 2) ? limit : ncap * 2;
+            char* nb = (char*)PyMem_RawRealloc(buf, ncap ? ncap : 1);
+            if (!nb) { wibesocket_release_slot(c, msg.slot); oom = 1; break; }
+            buf = nb; cap = ncap;
+        }
+        if (msg.payload_len) memcpy(buf + len, msg.payload, msg.payload_len);
+        len += msg.payload_len;
+        bool fin = msg.is_final;
+        wibesocket_release_slot(c, msg.slot);
+        if (fin) break;
+    }
+    if (too_large) (void)wibesocket_send_close(c, WIBESOCKET_CLOSE_TOO_LARGE, "message too large");
+    PyObject* result = NULL;
+    if (oom) PyErr_NoMemory();
+    else if (too_large) PyErr_SetString(PyExc_RuntimeError, "message too large");
+    else if (e == WIBESOCKET_OK) {
+        PyObject* data = PyBytes_FromStringAndSize(buf ? buf : "", (Py_ssize_t)len);
+        if (data) result = Py_BuildValue("iN", type, data);
+    } else if (type >= 0) {
+        /* The fragments already read are gone, so this can't be retried like a plain timeout */
+        PyErr_SetString(PyExc_RuntimeError, e == WIBESOCKET_ERROR_TIMEOUT ? "timed out mid-message" : wibesocket_error_string(e));
+    } else if (e == WIBESOCKET_ERROR_TIMEOUT || e == WIBESOCKET_ERROR_NOT_READY) {
+        result = Py_None; Py_INCREF(result);
+    } else {
+        PyErr_SetString(PyExc_RuntimeError, wibesocket_error_string(e));
+    }
+    PyMem_RawFree(buf);
+    return result;
+}
+
+/* New reference to loop, or to the running loop when loop is None */
+static PyObject* resolve_loop(PyObject* loop) {
+    if (loop != Py_None) { Py_INCREF(loop); return loop; }
+    PyObject* asyncio = PyImport_ImportModule("asyncio");
+    if (!asyncio) return NULL;
+    loop = PyObject_CallMethod(asyncio, "get_running_loop", NULL);
+    Py_DECREF(asyncio);
+    return loop;
+}
+
+/* Reader installed by recv_future; state is (capsule, future). Runs in C on every readiness
+   event and resolves the future once a whole frame is in. */
+static PyObject* recv_future_on_readable(PyObject* state, PyObject* unused) {
+    (void)unused;
+    PyObject* capsule = PyTuple_GET_ITEM(state, 0);
+    PyObject* fut = PyTuple_GET_ITEM(state, 1);
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c) return NULL;
+    uint32_t slot = 0;
+    PyObject* res = recv_frame(c, 0, &slot);
+    if (res == Py_None) { Py_DECREF(res); Py_RETURN_NONE; } /* partial frame: wait for more */
+    PyObject* done = PyObject_CallMethod(fut, "done", NULL);
+    if (!done) { Py_XDECREF(res); return NULL; }
+    int is_done = PyObject_IsTrue(done);
+    Py_DECREF(done);
+    if (is_done) {
+        if (res) wibesocket_release_slot(c, slot); /* nobody is left to release it */
+        Py_XDECREF(res);
+        PyErr_Clear();
+        Py_RETURN_NONE;
+    }
+    PyObject* r;
+    if (res) {
+        r = PyObject_CallMethod(fut, "set_result", "(O)", res);
+        Py_DECREF(res);
+    } else {
+        PyObject *type, *value, *tb;
+        PyErr_Fetch(&type, &value, &tb);
+        PyErr_NormalizeException(&type, &value, &tb);
+        r = PyObject_CallMethod(fut, "set_exception", "(O)", value);
+        Py_XDECREF(type); Py_XDECREF(value); Py_XDECREF(tb);
+    }
+    Py_XDECREF(r);
+    return r ? (Py_INCREF(Py_None), Py_None) : NULL;
+}
+
+/* Done callback; state is (loop, fd). Drops the reader however the future finished, cancellation included. */
+static PyObject* recv_future_on_done(PyObject* state, PyObject* fut) {
+    (void)fut;
+    return PyObject_CallMethod(PyTuple_GET_ITEM(state, 0), "remove_reader", "(O)", PyTuple_GET_ITEM(state, 1));
+}
+
+static PyMethodDef recv_future_on_readable_def = {"_on_readable", recv_future_on_readable, METH_NOARGS, NULL};
+static PyMethodDef recv_future_on_done_def = {"_on_done", recv_future_on_done, METH_O, NULL};
+
+static PyObject* py_recv_future(PyObject* self, PyObject* args, PyObject* kwargs) {
+    PyObject* capsule; PyObject* loop = Py_None;
+    static char* kwlist[] = {"conn", "loop", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "O|O", kwlist, &capsule, &loop)) return NULL;
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c) return NULL;
+    loop = resolve_loop(loop);
+    if (!loop) return NULL;
+    PyObject* fut = PyObject_CallMethod(loop, "create_future", NULL);
+    if (!fut) { Py_DECREF(loop); return NULL; }
+    /* A frame may already be buffered; then no selector round trip is needed at all */
+    PyObject* res = recv_frame(c, 0, NULL);
+    if (!res) goto fail;
+    if (res != Py_None) {
+        PyObject* r = PyObject_CallMethod(fut, "set_result", "(O)", res);
+        Py_DECREF(res);
+        if (!r) goto fail;
+        Py_DECREF(r);
+        Py_DECREF(loop);
+        return fut;
+    }
+    Py_DECREF(res);
+    PyObject* fd = PyLong_FromLong(wibesocket_fileno(c));
+    PyObject* rstate = fd ? PyTuple_Pack(2, capsule, fut) : NULL;
+    PyObject* dstate = rstate ? PyTuple_Pack(2, loop, fd) : NULL;
+    PyObject* on_readable = dstate ? PyCFunction_New(&recv_future_on_readable_def, rstate) : NULL;
+    PyObject* on_done = on_readable ? PyCFunction_New(&recv_future_on_done_def, dstate) : NULL;
+    PyObject* r = on_done ? PyObject_CallMethod(loop, "add_reader", "OO", fd, on_readable) : NULL;
+    if (r) {
+        Py_DECREF(r);
+        r = PyObject_CallMethod(fut, "add_done_callback", "(O)", on_done);
+    }
+    Py_XDECREF(r); Py_XDECREF(on_done); Py_XDECREF(on_readable);
+    Py_XDECREF(dstate); Py_XDECREF(rstate); Py_XDECREF(fd);
+    if (!r) goto fail;
+    Py_DECREF(loop);
+    return fut;
+fail:
+    Py_DECREF(fut);
+    Py_DECREF(loop);
+    return NULL;
+}
+
+/* Reader installed by attach_to_loop; state is (capsule, loop, fd, callback). Drains every
+   complete frame per wakeup, since frames already buffered in C never make the fd readable again. */
+static PyObject* attach_on_readable(PyObject* state, PyObject* unused) {
+    (void)unused;
+    PyObject* capsule = PyTuple_GET_ITEM(state, 0);
+    PyObject* callback = PyTuple_GET_ITEM(state, 3);
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c) return NULL;
+    for (;;) {
+        uint32_t slot = 0;
+        PyObject* res = recv_frame(c, 0, &slot);
+        if (!res) {
+            /* Closed or failed: stop watching, or a dead fd keeps the loop spinning */
+            PyObject *type, *value, *tb;
+            PyErr_Fetch(&type, &value, &tb);
+            PyObject* r = PyObject_CallMethod(PyTuple_GET_ITEM(state, 1), "remove_reader", "(O)", PyTuple_GET_ITEM(state, 2));
+            if (r) Py_DECREF(r); else PyErr_Clear();
+            PyErr_Restore(type, value, tb);
+            return NULL;
+        }
+        if (res == Py_None) { Py_DECREF(res); Py_RETURN_NONE; }
+        PyObject* r = PyObject_CallFunctionObjArgs(callback, res, NULL);
+        Py_DECREF(res);
+        /* The payload view is only valid during the callback */
+        wibesocket_release_slot(c, slot);
+        if (!r) return NULL;
+        Py_DECREF(r);
+    }
+}
+
+static PyMethodDef attach_on_readable_def = {"_on_readable", attach_on_readable, METH_NOARGS, NULL};
+
+static PyObject* py_attach_to_loop(PyObject* self, PyObject* args, PyObject* kwargs) {
+    PyObject* capsule; PyObject* loop; PyObject* callback;
+    static char* kwlist[] = {"conn", "loop", "callback", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OOO", kwlist, &capsule, &loop, &callback)) return NULL;
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c) return NULL;
+    if (!PyCallable_Check(callback)) {
+        PyErr_SetString(PyExc_TypeError, "callback must be callable");
+        return NULL;
+    }
+    loop = resolve_loop(loop);
+    if (!loop) return NULL;
+    PyObject* fd = PyLong_FromLong(wibesocket_fileno(c));
+    PyObject* state = fd ? PyTuple_Pack(4, capsule, loop, fd, callback) : NULL;
+    PyObject* on_readable = state ? PyCFunction_New(&attach_on_readable_def, state) : NULL;
+    PyObject* r = on_readable ? PyObject_CallMethod(loop, "add_reader", "OO", fd, on_readable) : NULL;
+    /* Frames that arrived before the reader existed are already buffered; deliver them now */
+    if (r) { Py_DECREF(r); r = PyObject_CallMethod(loop, "call_soon", "(O)", on_readable); }
+    Py_XDECREF(r); Py_XDECREF(on_readable); Py_XDECREF(state); Py_XDECREF(fd);
+    Py_DECREF(loop);
+    if (!r) return NULL;
+    Py_RETURN_NONE;
+}
+
+/* Frame every item of msgs and send them through one wibesocket_send_many call.
+   str items go out as TEXT (UTF-8); other buffers as BINARY unless opcodes gives one per message.
+   Returns how many messages were handed to the socket, or NULL with an exception on bad input. */
+static PyObject* send_many_impl(wibesocket_conn_t* c, PyObject* msgs, PyObject* opcodes, int text_only, const char* what) {
+    /* A tuple owns its items, so Python code run by a buffer or __index__ hook below can't
+       free a str whose UTF-8 pointer is already in out[] */
+    PyObject* seq = PySequence_Tuple(msgs);
+    if (!seq) {
+        if (PyErr_ExceptionMatches(PyExc_TypeError)) PyErr_SetString(PyExc_TypeError, what);
+        return NULL;
+    }
+    PyObject* ops = NULL;
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    PyObject** items = PySequence_Fast_ITEMS(seq);
+    wibesocket_message_t* out = (wibesocket_message_t*)PyMem_Calloc((size_t)(n ? n : 1), sizeof(*out));
+    Py_buffer* views = (Py_buffer*)PyMem_Calloc((size_t)(n ? n : 1), sizeof(*views));
+    Py_ssize_t nviews = 0;
+    PyObject* result = NULL;
+    if (!out || !views) { PyErr_NoMemory(); goto done; }
+    if (opcodes && opcodes != Py_None) {
+        ops = PySequence_Tuple(opcodes);
+        if (!ops) {
+            if (PyErr_ExceptionMatches(PyExc_TypeError)) PyErr_SetString(PyExc_TypeError, "opcodes must be a sequence of ints");
+            goto done;
+        }
+        if (PySequence_Fast_GET_SIZE(ops) != n) {
+            PyErr_SetString(PyExc_ValueError, "opcodes must have one entry per message");
+            goto done;
+        }
+    }
+    /* Resolve every payload up front; UTF-8 buffers stay valid while seq holds the items.
+       The GIL stays held for the send: the connection's queue and buffers have no lock of their own */
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject* obj = items[i];
+        if (PyUnicode_Check(obj)) {
+            Py_ssize_t len;
+            out[i].payload = PyUnicode_AsUTF8AndSize(obj, &len);
+            if (!out[i].payload) goto done;
+            out[i].payload_len = (size_t)len;
+            out[i].type = WIBESOCKET_FRAME_TEXT;
+        } else if (text_only && !PyBytes_Check(obj)) {
+            PyErr_SetString(PyExc_TypeError, what);
+            goto done;
+        } else {
+            if (PyObject_GetBuffer(obj, &views[nviews], PyBUF_SIMPLE) < 0) goto done;
+            out[i].payload = views[nviews].buf;
+            out[i].payload_len = (size_t)views[nviews].len;
+            nviews++;
+            out[i].type = text_only ? WIBESOCKET_FRAME_TEXT : WIBESOCKET_FRAME_BINARY;
+        }
+        if (ops) {
+            long op = PyLong_AsLong(PySequence_Fast_GET_ITEM(ops, i));
+            if (op == -1 && PyErr_Occurred()) goto done;
+            if (op != WIBESOCKET_FRAME_TEXT && op != WIBESOCKET_FRAME_BINARY) {
+                PyErr_SetString(PyExc_ValueError, "opcodes entries must be TEXT (1) or BINARY (2)");
+                goto done;
+            }
+            out[i].type = (wibesocket_frame_type_t)op;
+        }
+    }
+    size_t sent = 0;
+    (void)wibesocket_send_many(c, out, (size_t)n, &sent);
+    result = PyLong_FromSize_t(sent);
+done:
+    for (Py_ssize_t i = 0; i < nviews; i++) PyBuffer_Release(&views[i]);
+    PyMem_Free(views); PyMem_Free(out);
+    Py_XDECREF(ops); Py_DECREF(seq);
+    return result;
+}
+
+static PyObject* py_send_text_bulk(PyObject* self, PyObject* args) {
+    PyObject* capsule; PyObject* msgs;
+    if (!PyArg_ParseTuple(args, "OO", &capsule, &msgs)) return NULL;
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c) return PyLong_FromLong(0);
+    return send_many_impl(c, msgs, NULL, 1, "send_text_bulk expects a sequence of str or bytes");
+}
+
+static PyObject* py_send_many(PyObject* self, PyObject* args, PyObject* kwargs) {
+    PyObject* capsule; PyObject* msgs; PyObject* opcodes = Py_None;
+    static char* kwlist[] = {"conn", "msgs", "opcodes", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "OO|O", kwlist, &capsule, &msgs, &opcodes)) return NULL;
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c) return PyLong_FromLong(0);
+    return send_many_impl(c, msgs, opcodes, 0, "send_many expects a sequence of str or bytes-like objects");
+}
+
+/* Zero-copy counterpart of recv_bulk: views over every complete frame already buffered,
+   all sharing one slot that a single release_payload(conn, slot) unpins. */
+static PyObject* py_recv_batch(PyObject* self, PyObject* args, PyObject* kwargs) {
+    PyObject* capsule; Py_ssize_t max_frames; int timeout_ms = 0;
+    static char* kwlist[] = {"conn", "max_frames", "timeout_ms", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "On|i", kwlist, &capsule, &max_frames, &timeout_ms)) return NULL;
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c || max_frames <= 0) return PyList_New(0);
+    wibesocket_message_t* msgs = (wibesocket_message_t*)PyMem_Calloc((size_t)max_frames, sizeof(*msgs));
+    if (!msgs) return PyErr_NoMemory();
+    size_t got = 0;
+    wibesocket_error_t e = wibesocket_recv_batch(c, msgs, (size_t)max_frames, timeout_ms, &got);
+    if (e != WIBESOCKET_OK && e != WIBESOCKET_ERROR_TIMEOUT && e != WIBESOCKET_ERROR_NOT_READY) {
+        PyMem_Free(msgs);
+        PyErr_SetString(PyExc_RuntimeError, wibesocket_error_string(e));
+        return NULL;
+    }
+    PyObject* result = PyList_New((Py_ssize_t)got);
+    for (size_t i = 0; result && i < got; i++) {
+        PyObject* view = PyMemoryView_FromMemory((char*)msgs[i].payload, (Py_ssize_t)msgs[i].payload_len, PyBUF_READ);
+        PyObject* item = view ? Py_BuildValue("iNNk", (int)msgs[i].type, view, PyBool_FromLong(msgs[i].is_final), (unsigned long)msgs[i].slot) : NULL;
+        if (!item) { Py_CLEAR(result); break; }
+        PyList_SET_ITEM(result, (Py_ssize_t)i, item);
+    }
+    if (!result && got) wibesocket_release_slot(c, msgs[0].slot);
+    PyMem_Free(msgs);
+    return result;
+}
+
+typedef struct { int type; int is_final; size_t off; size_t len; } bulk_frame_t;
+
+static PyObject* py_recv_bulk(PyObject* self, PyObject* args, PyObject* kwargs) {
+    PyObject* capsule; Py_ssize_t max_frames; int timeout_ms = 1000;
+    static char* kwlist[] = {"conn", "n", "timeout_ms", NULL};
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "On|i", kwlist, &capsule, &max_frames, &timeout_ms)) return NULL;
+    wibesocket_conn_t* c = get_conn(capsule);
+    if (!c || max_frames <= 0) return PyList_New(0);
+    bulk_frame_t* frames = (bulk_frame_t*)PyMem_RawMalloc((size_t)max_frames * sizeof(*frames));
+    if (!frames) return PyErr_NoMemory();
+    char* arena = NULL; size_t arena_len = 0, arena_cap = 0;
+    Py_ssize_t got = 0;
+    wibesocket_error_t e = WIBESOCKET_OK;
+    int oom = 0;
+    /* Copy each payload into one arena and unpin it, so no frame stays pinned;
+       only the first recv waits, the rest take whatever is already readable */
+    while (got < max_frames) {
+        wibesocket_message_t msg; memset(&msg, 0, sizeof(msg));
+        e = wibesocket_recv(c, &msg, got ? 0 : timeout_ms);
+        if (e != WIBESOCKET_OK) break;
+        if (arena_len + msg.payload_len > arena_cap) {
+            size_t cap = arena_cap ? arena_cap : 4096;
+            while (cap < arena_len + msg.payload_len) cap *= 2;
+            char* na = (char*)PyMem_RawRealloc(arena, cap);
+            if (!na) { wibesocket_release_slot(c, msg.slot); oom = 1; break; }
+            arena = na; arena_cap = cap;
+        }
+        if (msg.payload_len) memcpy(arena + arena_len, msg.payload, msg.payload_len);
+        frames[got].type = (int)msg.type;
+        frames[got].is_final = (int)msg.is_final;
+        frames[got].off = arena_len;
+        frames[got].len = msg.payload_len;
+        arena_len += msg.payload_len;
+        got++;
+        wibesocket_release_slot(c, msg.slot);
+    }
+    PyObject* result = NULL;
+    PyObject* buf = NULL;
+    if (oom) { PyErr_NoMemory(); goto done; }
+    if (got == 0 && e != WIBESOCKET_OK && e != WIBESOCKET_ERROR_TIMEOUT && e != WIBESOCKET_ERROR_NOT_READY) {
+        PyErr_SetString(PyExc_RuntimeError, wibesocket_error_string(e));
+        goto done;
+    }
+    buf = PyBytes_FromStringAndSize(arena ? arena : "", (Py_ssize_t)arena_len);
+    if (!buf) goto done;
+    PyObject* whole = PyMemoryView_FromObject(buf);
+    if (!whole) goto done;
+    result = PyList_New(got);
+    for (Py_ssize_t i = 0; result && i < got; i++) {
+        PyObject* view = PySequence_GetSlice(whole, (Py_ssize_t)frames[i].off, (Py_ssize_t)(frames[i].off + frames[i].len));
+        PyObject* item = view ? Py_BuildValue("iNN", frames[i].type, view, PyBool_FromLong(frames[i].is_final)) : NULL;
+        if (!item) { Py_CLEAR(result); break; }
+        PyList_SET_ITEM(result, i, item);
+    }
+    Py_DECREF(whole);
+done:
+    Py_XDECREF(buf);
+    PyMem_RawFree(arena);
+    PyMem_RawFree(frames);
+    return result;
 }
 
 static PyObject* py_close(PyObject* self, PyObject* args) {
@@ -120,9 +574,16 @@ static PyObject* py_fileno(PyObject* self, PyObject* args) {
 }
 
 static PyObject* py_release_payload(PyObject* self, PyObject* args) {
-    PyObject* capsule; if (!PyArg_ParseTuple(args, "O", &capsule)) return NULL;
+    PyObject* capsule; PyObject* slot = Py_None;
+    if (!PyArg_ParseTuple(args, "O|O", &capsule, &slot)) return NULL;
     wibesocket_conn_t* c = get_conn(capsule); if (!c) Py_RETURN_NONE;
-    wibesocket_release_payload(c);
+    if (slot == Py_None) {
+        wibesocket_release_payload(c);
+        Py_RETURN_NONE;
+    }
+    unsigned long id = PyLong_AsUnsignedLong(slot);
+    if (id == (unsigned long)-1 && PyErr_Occurred()) return NULL;
+    wibesocket_release_slot(c, (uint32_t)id);
     Py_RETURN_NONE;
 }
 
@@ -139,11 +600,19 @@ static PyObject* py_poll_events(PyObject* self, PyObject* args, PyObject* kwargs
 
 static PyMethodDef Methods[] = {
     {"connect", (PyCFunction)py_connect, METH_VARARGS | METH_KEYWORDS, "Connect to a WebSocket (non-blocking)."},
-    {"send_text", py_send_text, METH_VARARGS, "Send a text message (str or bytes)."},
+    {"send_text", py_send_text, METH_VARARGS, "Send a text message (str, or UTF-8 in a bytes-like object)."},
     {"send_binary", py_send_binary, METH_VARARGS, "Send binary data (bytes-like)."},
-    {"recv", (PyCFunction)py_recv, METH_VARARGS | METH_KEYWORDS, "Receive a message; returns (type, bytes, is_final) or None on timeout."},
+    {"recv", (PyCFunction)py_recv, METH_VARARGS | METH_KEYWORDS, "Receive a message; returns (type, memoryview, is_final, slot) or None on timeout."},
+    {"recv_until", (PyCFunction)py_recv_until, METH_VARARGS | METH_KEYWORDS, "Receive until a frame whose payload contains pattern; returns (type, memoryview, is_final, slot) or None on timeout."},
+    {"recv_message", (PyCFunction)py_recv_message, METH_VARARGS | METH_KEYWORDS, "Receive one whole message, joining fragments, as (type, bytes) or None on timeout; longer than max_bytes closes with 1009."},
+    {"recv_future", (PyCFunction)py_recv_future, METH_VARARGS | METH_KEYWORDS, "Return an asyncio future resolved with the next (type, memoryview, is_final, slot); readiness is handled in C."},
+    {"attach_to_loop", (PyCFunction)py_attach_to_loop, METH_VARARGS | METH_KEYWORDS, "Call callback((type, memoryview, is_final, slot)) from a C-level loop reader for every frame; the view is valid only during the call."},
+    {"send_many", (PyCFunction)py_send_many, METH_VARARGS | METH_KEYWORDS, "Send a sequence of messages (str as TEXT, bytes-like as BINARY, or per-message opcodes) in as few writes as possible; returns how many were sent."},
+    {"send_text_bulk", py_send_text_bulk, METH_VARARGS, "Send a sequence of text messages in one call; returns how many were sent."},
+    {"recv_bulk", (PyCFunction)py_recv_bulk, METH_VARARGS | METH_KEYWORDS, "Receive up to n messages; returns a list of (type, memoryview, is_final) over one shared buffer."},
+    {"recv_batch", (PyCFunction)py_recv_batch, METH_VARARGS | METH_KEYWORDS, "Receive up to max_frames buffered messages as zero-copy (type, memoryview, is_final, slot) sharing one slot; one release_payload(conn, slot) releases them all."},
     {"fileno", py_fileno, METH_VARARGS, "Return underlying socket fd for asyncio integration."},
-    {"release_payload", py_release_payload, METH_VARARGS, "Release pinned recv payload to allow subsequent recv calls."},
+    {"release_payload", py_release_payload, METH_VARARGS, "Release a pinned recv payload by slot (default: the most recent one still held)."},
     {"poll_events", (PyCFunction)py_poll_events, METH_VARARGS | METH_KEYWORDS, "Poll for readiness; returns True if ready, False on timeout."},
     {"send_close", py_send_close, METH_VARARGS, "Send a close frame (code, optional reason)."},
     {"close", py_close, METH_VARARGS, "Close connection."},
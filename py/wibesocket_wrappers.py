@@ -19,23 +19,32 @@ Notes
 - Close explicitly to teardown cleanly; do not rely on GC
 """
 
-import asyncio
+import collections
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    # Imported where the async paths run, so loading this module doesn't pull in asyncio
+    import asyncio
 
 import wibesocket as _c
 
 
 def _run_sync(coro):
-    """Run an async coroutine from sync code safely."""
+    """Run an async coroutine from sync code safely.
+
+    Raises RuntimeError when called from a running loop: use the async API there
+    instead of nesting a second loop inside it.
+    """
+    import asyncio
+
     try:
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            return asyncio.run(coro)
-        return loop.run_until_complete(coro)
+        asyncio.get_running_loop()
     except RuntimeError:
         return asyncio.run(coro)
+    coro.close()
+    raise RuntimeError("sync wrapper called from a running event loop; await the async method instead")
 
 
 class FrameType(IntEnum):
@@ -67,11 +76,12 @@ class Frame:
     data: memoryview
     is_final: bool
     _released: bool = False
+    _slot: Optional[int] = None  # C pin slot holding the payload
 
     def release(self) -> None:
         """Release the pinned payload buffer back to the C layer."""
         if not self._released:
-            _c.release_payload(self.conn)
+            _c.release_payload(self.conn, self._slot)
             self._released = True
 
     def __enter__(self) -> "Frame":
@@ -80,10 +90,6 @@ class Frame:
     def __exit__(self, exc_type, exc, tb) -> None:
         self.release()
 
-    def __del__(self) -> None:
-        # Avoid C calls in GC context; rely on explicit release or context manager
-        self._released = True
-
     def text(self, errors: str = "strict") -> str:
         return self.data.tobytes().decode("utf-8", errors)
 
@@ -153,15 +159,13 @@ class WebSocket:
 
     # Receiving
     async def recv(self, timeout_ms: int = 0) -> Optional[Frame]:
-        # Poll for readiness, then do a non-blocking recv
-        ready = _c.poll_events(self._c, timeout_ms=timeout_ms)
-        if not ready:
-            return None
-        res = _c.recv(self._c, timeout_ms=0)
+        # C recv serves buffered frames first and only then waits on the fd, so one call
+        # covers both; a separate poll_events would cost an extra epoll_wait per frame
+        res = _c.recv(self._c, timeout_ms=timeout_ms)
         if res is None:
             return None
-        ftype, data, is_final = res
-        return Frame(self._c, FrameType(ftype), data, bool(is_final))
+        ftype, data, is_final, slot = res
+        return Frame(self._c, FrameType(ftype), data, bool(is_final), _slot=slot)
 
     def recv_sync(self, timeout_ms: int = 0) -> Optional[Frame]:
         return _run_sync(self.recv(timeout_ms=timeout_ms))
@@ -182,45 +186,82 @@ class WebSocket:
 
 
 class AsyncWebSocket:
-    """Asyncio wrapper using add_reader for zero-copy reads."""
+    """Asyncio wrapper holding one add_reader registration until close()."""
+
+    # Frames taken per recv_bulk call while draining
+    _DRAIN_BATCH = 64
 
     def __init__(self, ws: WebSocket, loop: Optional[asyncio.AbstractEventLoop] = None):
+        import asyncio
+
         self._ws = ws
         self._loop = loop or asyncio.get_running_loop()
         self._fd = ws.fileno()
         self._fut: Optional[asyncio.Future] = None
+        self._queue: "collections.deque[Frame]" = collections.deque()
+        self._exc: Optional[BaseException] = None
+        self._loop.add_reader(self._fd, self._on_readable)
 
     @classmethod
     async def connect(cls, uri: str, **kwargs) -> "AsyncWebSocket":
         return cls(await WebSocket.connect(uri, **kwargs))
 
     def _on_readable(self) -> None:
-        if not self._fut or self._fut.done():
+        # Straight into C: this runs inside the loop, where recv_sync would need a second loop.
+        # Frames are copied out so queued ones don't pin the receive buffer.
+        try:
+            while True:
+                frames = _c.recv_bulk(self._ws._c, self._DRAIN_BATCH, timeout_ms=0)
+                self._queue.extend(
+                    Frame(self._ws._c, FrameType(ftype), data, is_final, _released=True)
+                    for ftype, data, is_final in frames
+                )
+                if len(frames) < self._DRAIN_BATCH:
+                    break
+        except Exception as e:
+            self._exc = e
+            self._loop.remove_reader(self._fd)
+            if self._fut is not None and not self._fut.done():
+                self._fut.set_exception(e)
             return
-        fr = self._ws.recv_sync(timeout_ms=0)
-        if fr is not None:
-            self._fut.set_result(fr)
+        if self._queue and self._fut is not None and not self._fut.done():
+            self._fut.set_result(self._queue.popleft())
 
     async def recv(self, timeout: float | None = None) -> Frame:
         """Await a frame with an optional timeout (seconds)."""
-        self._fut = self._loop.create_future()
-        self._loop.add_reader(self._fd, self._on_readable)
+        if self._queue:
+            return self._queue.popleft()
+        if self._exc is not None:
+            raise self._exc
+        fut = self._fut = self._loop.create_future()
+        timer = None if timeout is None else self._loop.call_later(timeout, self._on_timeout, fut)
         try:
-            return await asyncio.wait_for(self._fut, timeout=timeout)
+            return await fut
         finally:
-            self._loop.remove_reader(self._fd)
+            self._fut = None
+            if timer is not None:
+                timer.cancel()
+
+    @staticmethod
+    def _on_timeout(fut: asyncio.Future) -> None:
+        import asyncio
+
+        if not fut.done():
+            fut.set_exception(asyncio.TimeoutError())
 
     # Proxy helpers
     def send_text(self, data: str | bytes) -> None:
-        self._ws.send_sync(data)
+        if not _c.send_text(self._ws._c, data):
+            raise RuntimeError("send failed")
 
     def send_binary(self, data: bytes | memoryview) -> None:
-        self._ws.send_sync(data)
+        if not _c.send_binary(self._ws._c, memoryview(data)):
+            raise RuntimeError("send failed")
 
     def close(self, code: int = 1000, reason: Optional[str] = None) -> None:
-        self._ws.close_sync(code, reason)
-
-from __future__ import annotations
+        self._loop.remove_reader(self._fd)
+        _c.send_close(self._ws._c, code, reason or "")
+        _c.close(self._ws._c)
 
 """High-level, pythonic wrappers over the zero-copy C extension.
 
@@ -241,14 +282,23 @@ Notes
 - Close explicitly to teardown cleanly; do not rely on GC
 """
 
-import asyncio
-import contextlib
-from dataclasses import dataclass
+import collections
+import weakref
 from enum import IntEnum
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    # asyncio is imported on first AsyncWebSocket use; sync-only callers never pay for it
+    import asyncio
 
 import wibesocket as _c
 
+# Hot-path entry points bound once, saving the _c attribute lookup on every call
+_c_recv = _c.recv
+_c_send_text = _c.send_text
+_c_send_binary = _c.send_binary
+_c_release_payload = _c.release_payload
+
 
 class FrameType(IntEnum):
     """WebSocket frame types per RFC 6455."""
@@ -261,11 +311,32 @@ class FrameType(IntEnum):
     PONG = 0xA
 
 
-@dataclass
+# Opcode-indexed table for the recv path; calling FrameType(code) goes through EnumMeta.__call__
+# per frame. Reserved opcodes (never delivered by the C parser) map to their plain int.
+_FRAME_TYPES = [FrameType._value2member_map_.get(code, code) for code in range(16)]
+
+# Power-of-two size classes of bytearrays behind Frame.detach(), a few idle buffers per class
+_DETACH_POOL: Dict[int, List[bytearray]] = {}
+_DETACH_POOL_DEPTH = 8
+
+
+def _reclaim_buffer(buf: bytearray, free: List[bytearray]) -> None:
+    # Resizing raises BufferError while any view still exports buf (e.g. a slice of the
+    # detached view); such a buffer is left to the GC rather than handed out again
+    try:
+        buf.append(0)
+    except BufferError:
+        return
+    buf.pop()
+    if len(free) < _DETACH_POOL_DEPTH:
+        free.append(buf)
+
+
 class Frame:
     """Zero-copy received frame.
 
-    Use as a context manager or call release() promptly to allow subsequent recv() calls.
+    Use as a context manager or call release() promptly. Up to 16 frames can be held
+    at once; while that many are unreleased, recv() returns None.
 
     Attributes:
         conn: Capsule object referencing the underlying C connection
@@ -274,21 +345,71 @@ class Frame:
         is_final: whether this is the final fragment in a message
     """
 
-    conn: object  # C capsule
-    type: FrameType
-    data: memoryview
-    is_final: bool
-    _released: bool = False
+    # One Frame per received message: slots keep it dict-free and cheap to build
+    __slots__ = ("conn", "type", "data", "is_final", "_released", "_batch", "_slot")
+
+    def __init__(
+        self,
+        conn: object,
+        type: FrameType,
+        data: memoryview,
+        is_final: bool,
+        _released: bool = False,
+        _batch: Optional[List[int]] = None,
+        _slot: Optional[int] = None,
+    ):
+        self.conn = conn  # C capsule
+        self.type = type
+        self.data = data
+        self.is_final = is_final
+        self._released = _released
+        self._batch = _batch  # [frames still held] shared by one recv_batch() result
+        self._slot = _slot  # C pin slot holding the payload
+
+    def __repr__(self) -> str:
+        if self.data is None:
+            return f"Frame(type={self.type!r}, released, is_final={self.is_final})"
+        return f"Frame(type={self.type!r}, len={len(self.data)}, is_final={self.is_final})"
 
     def release(self) -> None:
         """Release the pinned payload buffer back to the C layer.
 
-        This invalidates the memoryview. Always call before recv() again,
-        or use "with frame:" to release automatically.
+        This invalidates the memoryview and sets data to None. Frames may be released
+        in any order; use "with frame:" to release automatically. Releasing again is a no-op.
         """
         if not self._released:
-            _c.release_payload(self.conn)
             self._released = True
+            self.data = None
+            batch = self._batch
+            if batch is not None:
+                # The batch shares one pin; the last frame released lets it go
+                batch[0] -= 1
+                if not batch[0]:
+                    _c_release_payload(self.conn, self._slot)
+                return
+            _c_release_payload(self.conn, self._slot)
+
+    def detach(self) -> memoryview:
+        """Copy the payload into a pooled buffer and release the frame.
+
+        Use this instead of data.tobytes() to keep a payload beyond the frame's
+        lifetime. The returned view's backing bytearray goes back to the pool once
+        the view and every slice of it are dropped.
+        """
+        data = self.data
+        if data is None:
+            raise ValueError("frame already released")
+        n = len(data)
+        size = 1 << max(n - 1, 0).bit_length()
+        free = _DETACH_POOL.get(size)
+        if free is None:
+            free = _DETACH_POOL[size] = []
+        buf = free.pop() if free else bytearray(size)
+        buf[:n] = data
+        view = memoryview(buf)[:n]
+        weakref.finalize(view, _reclaim_buffer, buf, free).atexit = False
+        self.release()
+        return view
 
     def __enter__(self) -> "Frame":
         return self
@@ -296,17 +417,14 @@ class Frame:
     def __exit__(self, exc_type, exc, tb) -> None:
         self.release()
 
-    def __del__(self) -> None:
-        # Avoid C calls in GC context; rely on explicit release or context manager
-        self._released = True
-
     def text(self, errors: str = "strict") -> str:
         """Decode the payload as UTF-8 text.
 
         Args:
             errors: error handling strategy for decode
         """
-        return self.data.tobytes().decode("utf-8", errors)
+        # str() decodes straight from the buffer; tobytes() would copy the payload first
+        return str(self.data, "utf-8", errors)
 
 
 class WebSocket:
@@ -338,6 +456,7 @@ class WebSocket:
         user_agent: Optional[str] = None,
         origin: Optional[str] = None,
         protocol: Optional[str] = None,
+        busy_poll_us: int = 0,
     ) -> "WebSocket":
         """Connect to a WebSocket server.
 
@@ -348,6 +467,8 @@ class WebSocket:
             user_agent: optional User-Agent
             origin: optional Origin
             protocol: optional subprotocol
+            busy_poll_us: SO_BUSY_POLL budget in microseconds; 0 disables. Lowers latency for
+                a few busy connections at the cost of CPU; leave off for many idle ones
         """
         c = _c.connect(
             uri,
@@ -356,6 +477,7 @@ class WebSocket:
             user_agent=user_agent,
             origin=origin,
             protocol=protocol,
+            busy_poll_us=busy_poll_us,
         )
         if c is None:
             raise ConnectionError("wibesocket connect failed")
@@ -368,13 +490,13 @@ class WebSocket:
         self.close()
 
     # Sending
-    def send_text(self, data: str | bytes) -> None:
+    def send_text(self, data: str | bytes | memoryview) -> None:
         """Send a text message (UTF-8).
 
         Args:
-            data: str (encoded as UTF-8) or bytes
+            data: str (encoded as UTF-8) or already-encoded bytes-like
         """
-        ok = _c.send_text(self._c, data if isinstance(data, bytes) else data)
+        ok = _c_send_text(self._c, data)
         if not ok:
             raise RuntimeError("send_text failed")
 
@@ -384,21 +506,100 @@ class WebSocket:
         Args:
             data: bytes-like object
         """
-        ok = _c.send_binary(self._c, memoryview(data))
+        ok = _c_send_binary(self._c, data)
         if not ok:
             raise RuntimeError("send_binary failed")
 
+    def send_text_bulk(self, msgs: Iterable[str | bytes]) -> None:
+        """Send several text messages with a single call into the C layer.
+
+        Args:
+            msgs: str (encoded as UTF-8) or bytes messages, sent in order
+        """
+        msgs = msgs if isinstance(msgs, (list, tuple)) else list(msgs)
+        sent = _c.send_text_bulk(self._c, msgs)
+        if sent != len(msgs):
+            raise RuntimeError(f"send_text_bulk failed after {sent} of {len(msgs)} messages")
+
+    def send_many(self, msgs: Iterable[str | bytes | memoryview]) -> None:
+        """Send several messages, framed together and written with as few syscalls as possible.
+
+        Args:
+            msgs: str items go out as TEXT (UTF-8), bytes-like items as BINARY, in order
+        """
+        msgs = msgs if isinstance(msgs, (list, tuple)) else list(msgs)
+        sent = _c.send_many(self._c, msgs)
+        if sent != len(msgs):
+            raise RuntimeError(f"send_many failed after {sent} of {len(msgs)} messages")
+
     # Receiving
     def recv(self, timeout_ms: int = 0) -> Optional[Frame]:
         """Receive the next frame.
 
         Returns a Frame or None on timeout. Use "with Frame:" or call release().
+        PONGs are returned as FrameType.PONG; PINGs are answered in C and never seen here.
         """
-        res = _c.recv(self._c, timeout_ms=timeout_ms)
+        c = self._c
+        res = _c_recv(c, timeout_ms)
+        if res is None:
+            return None
+        ftype, data, is_final, slot = res
+        # Always a fresh Frame: a recycled one would change under callers still holding it
+        return Frame(c, _FRAME_TYPES[ftype], data, is_final, _slot=slot)
+
+    def recv_until(self, pattern: bytes, timeout_ms: int = 0) -> Optional[Frame]:
+        """Receive the next frame whose payload contains pattern.
+
+        Frames without it are skipped and released inside the C layer, so the wait
+        never returns to Python. Returns None on timeout; timeout_ms < 0 waits forever.
+        """
+        c = self._c
+        res = _c.recv_until(c, pattern, timeout_ms)
+        if res is None:
+            return None
+        ftype, data, is_final, slot = res
+        return Frame(c, _FRAME_TYPES[ftype], data, is_final, _slot=slot)
+
+    def recv_message(self, max_bytes: int = 1 << 20, timeout_ms: int = 0) -> Optional[Frame]:
+        """Receive one whole message, joining its fragments in the C layer.
+
+        The returned Frame owns a copy of the payload (no release() needed) and has
+        the first fragment's type; PONGs arriving meanwhile are skipped. A message longer than max_bytes closes the connection
+        with 1009 and raises RuntimeError. Returns None on timeout.
+        """
+        res = _c.recv_message(self._c, max_bytes, timeout_ms)
         if res is None:
             return None
-        ftype, data, is_final = res
-        return Frame(self._c, FrameType(ftype), data, bool(is_final))
+        ftype, data = res
+        return Frame(self._c, _FRAME_TYPES[ftype], memoryview(data), True, _released=True)
+
+    def recv_bulk(self, n: int, timeout_ms: int = 0) -> List[Frame]:
+        """Receive up to n frames with a single call into the C layer.
+
+        Waits up to timeout_ms for the first frame, then takes only frames that are
+        already readable. Payloads are copied into one buffer shared by the returned
+        frames, so they stay valid across later recv() calls and need no release().
+        """
+        return [
+            Frame(self._c, _FRAME_TYPES[ftype], data, is_final, _released=True)
+            for ftype, data, is_final in _c.recv_bulk(self._c, n, timeout_ms=timeout_ms)
+        ]
+
+    def recv_batch(self, max_frames: int = 16, timeout_ms: int = 0) -> List[Frame]:
+        """Receive the next frame plus every complete frame already buffered behind it.
+
+        Zero-copy like recv(): each Frame views the C buffer. The payloads share one
+        pin, so they stay valid until every frame of the batch is released.
+        """
+        c = self._c
+        got = _c.recv_batch(c, max_frames, timeout_ms)
+        if not got:
+            return []
+        batch = [len(got)]
+        return [
+            Frame(c, _FRAME_TYPES[ftype], data, is_final, _batch=batch, _slot=slot)
+            for ftype, data, is_final, slot in got
+        ]
 
     # Control
     def ping(self, data: bytes = b"") -> None:
@@ -419,7 +620,11 @@ class WebSocket:
 
 
 class AsyncWebSocket:
-    """Asyncio wrapper using add_reader for zero-copy reads.
+    """Asyncio wrapper that keeps one add_reader registration for the connection's lifetime.
+
+    Each readiness callback drains every frame already received with recv_bulk, so
+    bursts cost one wakeup rather than one reader add/remove per frame. Frames are
+    copied out of the C buffer and need no release().
 
     Example:
         >>> import asyncio
@@ -433,11 +638,19 @@ class AsyncWebSocket:
         ...     aws.close()
     """
 
+    # Frames taken per recv_bulk call while draining
+    _DRAIN_BATCH = 64
+
     def __init__(self, ws: WebSocket, loop: Optional[asyncio.AbstractEventLoop] = None):
+        import asyncio
+
         self._ws = ws
         self._loop = loop or asyncio.get_running_loop()
         self._fd = ws.fileno()
         self._fut: Optional[asyncio.Future] = None
+        self._queue: "collections.deque[Frame]" = collections.deque()
+        self._exc: Optional[BaseException] = None
+        self._loop.add_reader(self._fd, self._on_readable)
 
     @classmethod
     async def connect(cls, uri: str, **kwargs) -> "AsyncWebSocket":
@@ -445,20 +658,51 @@ class AsyncWebSocket:
         return cls(WebSocket.connect(uri, **kwargs))
 
     def _on_readable(self) -> None:
-        if not self._fut or self._fut.done():
+        # Runs on every wakeup: attribute lookups are taken once, outside the drain loop
+        recv_bulk = self._ws.recv_bulk
+        queue = self._queue
+        batch = self._DRAIN_BATCH
+        fut = self._fut
+        # Keep going until a short batch: frames left in the C buffer won't make the fd readable again
+        try:
+            while True:
+                frames = recv_bulk(batch)
+                queue.extend(frames)
+                if len(frames) < batch:
+                    break
+        except Exception as e:
+            # Closed or failed: stop watching, or the dead fd keeps waking the loop.
+            # Kept for recv(), since no reader is left to wake a later waiter
+            self._exc = e
+            self._loop.remove_reader(self._fd)
+            if fut is not None and not fut.done():
+                fut.set_exception(e)
             return
-        fr = self._ws.recv(timeout_ms=0)
-        if fr is not None:
-            self._fut.set_result(fr)
+        if queue and fut is not None and not fut.done():
+            fut.set_result(queue.popleft())
 
     async def recv(self, timeout: float | None = None) -> Frame:
         """Await a frame with an optional timeout (seconds)."""
-        self._fut = self._loop.create_future()
-        self._loop.add_reader(self._fd, self._on_readable)
+        if self._queue:
+            return self._queue.popleft()
+        if self._exc is not None:
+            raise self._exc
+        fut = self._fut = self._loop.create_future()
+        # A bare timer on the future is cheaper than wait_for's wrapping on every frame
+        timer = None if timeout is None else self._loop.call_later(timeout, self._on_timeout, fut)
         try:
-            return await asyncio.wait_for(self._fut, timeout=timeout)
+            return await fut
         finally:
-            self._loop.remove_reader(self._fd)
+            self._fut = None
+            if timer is not None:
+                timer.cancel()
+
+    @staticmethod
+    def _on_timeout(fut: asyncio.Future) -> None:
+        import asyncio
+
+        if not fut.done():
+            fut.set_exception(asyncio.TimeoutError())
 
     # Proxy helpers
     def send_text(self, data: str | bytes) -> None:
@@ -467,7 +711,15 @@ class AsyncWebSocket:
     def send_binary(self, data: bytes | memoryview) -> None:
         self._ws.send_binary(data)
 
+    def send_many(self, msgs: Iterable[str | bytes | memoryview]) -> None:
+        self._ws.send_many(msgs)
+
     def close(self, code: int = 1000, reason: Optional[str] = None) -> None:
+        self._loop.remove_reader(self._fd)
         self._ws.close(code, reason)
 
+    def __enter__(self) -> "AsyncWebSocket":
+        return self
 
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -11,6 +11,7 @@
 #include <netinet/tcp.h>
 #if defined(__linux__)
 #include <sys/random.h>
+#include <asm/socket.h> /* SO_BUSY_POLL; sys/socket.h hides it under _POSIX_C_SOURCE */
 #endif
 #include <netdb.h>
 #include <time.h>
@@ -20,6 +21,14 @@
 #include "internal/ringbuf.h"
 #include "handshake.h"
 
+/* Frames that can be held zero-copy at once; a power of two */
+#define WS_PIN_SLOTS 16u
+
+typedef struct {
+    uint32_t seq;    /* slot id handed out in wibesocket_message_t.slot */
+    uint32_t refcnt; /* 0 once released */
+} ws_pin_slot_t;
+
 typedef struct wibesocket_conn {
     int                fd;
     int                epfd;
@@ -33,15 +42,17 @@ typedef struct wibesocket_conn {
 
     /* recv */
     uint8_t* recv_buf;
-    size_t   recv_size;
+    size_t   recv_off;  /* start of bytes not yet handed out */
+    size_t   recv_size; /* end of buffered bytes */
     size_t   recv_cap;
     size_t   pending_consume;
     ws_parser_t parser;
 
-    /* FFI payload lifetime pinning */
-    const uint8_t* pinned_payload;
-    size_t         pinned_len;
-    int            pinned_refcnt;
+    /* FFI payload lifetime pinning: one slot per frame handed out, live from pin_head to
+       pin_tail. Slot ids are sequence numbers, so a stale id never matches a reused slot. */
+    ws_pin_slot_t pins[WS_PIN_SLOTS];
+    uint32_t      pin_head;
+    uint32_t      pin_tail;
 
     /* Send queue (non-blocking partial writes) */
     uint8_t* send_buf;
@@ -49,6 +60,16 @@ typedef struct wibesocket_conn {
     size_t   send_off;  /* bytes already sent */
     size_t   send_cap;  /* capacity */
 
+    int      want_out;  /* EPOLLOUT registered while the send queue is non-empty */
+
+    /* Outgoing frame scratch, grown on demand and reused by every send */
+    uint8_t* frame_buf;
+    size_t   frame_cap;
+
+    /* Masking keys drawn from one getrandom() per 64 frames */
+    uint8_t  mask_pool[256];
+    size_t   mask_left;
+
     /* Close handshake */
     int      close_sent;
     uint64_t close_sent_ms;
@@ -95,6 +116,12 @@ static int ep_mod_in(int epfd, int fd) {
     return epoll_ctl(epfd, EPOLL_CTL_MOD, fd, &ev);
 }
 
+static int ep_mod_inout(int epfd, int fd) {
+    struct epoll_event ev; memset(&ev, 0, sizeof(ev));
+    ev.events = EPOLLIN | EPOLLOUT | EPOLLET; ev.data.fd = fd;
+    return epoll_ctl(epfd, EPOLL_CTL_MOD, fd, &ev);
+}
+
 static int wait_epoll(int epfd, int timeout_ms) {
     struct epoll_event ev; return epoll_wait(epfd, &ev, 1, timeout_ms);
 }
@@ -229,6 +256,12 @@ wibesocket_conn_t* wibesocket_connect(const char* uri, const wibesocket_config_t
         int one = 1; (void)setsockopt(c->fd, IPPROTO_TCP, TCP_NODELAY, &one, sizeof(one));
         int buf = 1 << 20; (void)setsockopt(c->fd, SOL_SOCKET, SO_SNDBUF, &buf, sizeof(buf));
         (void)setsockopt(c->fd, SOL_SOCKET, SO_RCVBUF, &buf, sizeof(buf));
+#ifdef SO_BUSY_POLL
+        if (c->cfg.busy_poll_us) {
+            int us = (int)c->cfg.busy_poll_us;
+            (void)setsockopt(c->fd, SOL_SOCKET, SO_BUSY_POLL, &us, sizeof(us));
+        }
+#endif
     }
     c->epfd = epoll_create1(EPOLL_CLOEXEC);
     if (c->epfd < 0) { c->last_error = WIBESOCKET_ERROR_NETWORK; goto fail; }
@@ -252,49 +285,113 @@ fail:
     return NULL;
 }
 
-static void gen_mask(uint8_t m[4]) {
+static void gen_mask(wibesocket_conn* c, uint8_t m[4]) {
 #if defined(__linux__)
-    ssize_t r = getrandom(m, 4, 0);
-    if (r == 4) return;
+    if (c->mask_left < 4) {
+        ssize_t r = getrandom(c->mask_pool, sizeof(c->mask_pool), 0);
+        c->mask_left = (r == (ssize_t)sizeof(c->mask_pool)) ? sizeof(c->mask_pool) : 0;
+    }
+    if (c->mask_left >= 4) {
+        memcpy(m, c->mask_pool + sizeof(c->mask_pool) - c->mask_left, 4);
+        c->mask_left -= 4;
+        return;
+    }
+#else
+    (void)c;
 #endif
     unsigned x = (unsigned)time(NULL);
     for (int i = 0; i < 4; i++) { x = x * 1103515245u + 12345u; m[i] = (uint8_t)(x >> 24); }
 }
 
-static wibesocket_error_t send_frame(wibesocket_conn* c, ws_opcode_t opcode, const void* data, size_t len) {
-    if (!c || c->state != WIBESOCKET_STATE_OPEN) return WIBESOCKET_ERROR_NOT_READY;
-    uint8_t mask[4]; gen_mask(mask);
-    size_t hdr = 2 + ((len <= 125) ? 0 : (len <= 0xFFFF ? 2 : 8)) + 4;
-    size_t need = hdr + len;
-    uint8_t* buf = (uint8_t*)malloc(need);
-    if (!buf) return WIBESOCKET_ERROR_MEMORY;
-    size_t n = ws_build_frame(buf, need, 1, opcode, mask, (const uint8_t*)data, len);
-    if (n == 0) { free(buf); return WIBESOCKET_ERROR_BUFFER_FULL; }
-    /* Try immediate send */
+static size_t ws_frame_len(size_t len) {
+    return 2 + ((len <= 125) ? 0 : (len <= 0xFFFF ? 2 : 8)) + 4 + len;
+}
+
+static int ws_frame_reserve(wibesocket_conn* c, size_t need) {
+    if (need <= c->frame_cap) return 0;
+    uint8_t* nb = (uint8_t*)realloc(c->frame_buf, need);
+    if (!nb) return -1;
+    c->frame_buf = nb; c->frame_cap = need;
+    return 0;
+}
+
+/* Hand n encoded bytes to the socket, queueing whatever doesn't go out right away */
+static wibesocket_error_t ws_write_out(wibesocket_conn* c, const uint8_t* buf, size_t n) {
+    /* Frames must go out in order: behind a non-empty queue, append rather than send */
+    if (c->send_off < c->send_size) ws_flush_send(c);
+    if (c->send_off < c->send_size) {
+        int rc = ws_queue_append(c, buf, n);
+        return (rc < 0) ? WIBESOCKET_ERROR_MEMORY : WIBESOCKET_OK;
+    }
     #ifdef MSG_NOSIGNAL
     const int send_flags = MSG_NOSIGNAL;
     #else
     const int send_flags = 0;
     #endif
     ssize_t wr = send(c->fd, buf, n, send_flags);
-    if (wr == (ssize_t)n) { free(buf); return WIBESOCKET_OK; }
+    if (wr == (ssize_t)n) return WIBESOCKET_OK;
     if (wr < 0 && (errno == EAGAIN || errno == EWOULDBLOCK)) {
         /* queue entire frame */
         int rc = ws_queue_append(c, buf, n);
-        free(buf);
         if (rc < 0) return WIBESOCKET_ERROR_MEMORY;
         return WIBESOCKET_OK;
     }
     if (wr >= 0 && (size_t)wr < n) {
         int rc = ws_queue_append(c, buf + wr, n - (size_t)wr);
-        free(buf);
         if (rc < 0) return WIBESOCKET_ERROR_MEMORY;
         return WIBESOCKET_OK;
     }
-    free(buf);
     return WIBESOCKET_ERROR_NETWORK;
 }
 
+static wibesocket_error_t send_frame(wibesocket_conn* c, ws_opcode_t opcode, const void* data, size_t len) {
+    if (!c || c->state != WIBESOCKET_STATE_OPEN) return WIBESOCKET_ERROR_NOT_READY;
+    uint8_t mask[4]; gen_mask(c, mask);
+    size_t need = ws_frame_len(len);
+    if (ws_frame_reserve(c, need) < 0) return WIBESOCKET_ERROR_MEMORY;
+    size_t n = ws_build_frame(c->frame_buf, need, 1, opcode, mask, (const uint8_t*)data, len);
+    if (n == 0) return WIBESOCKET_ERROR_BUFFER_FULL;
+    return ws_write_out(c, c->frame_buf, n);
+}
+
+/* Batches are encoded into the scratch buffer in runs of about this many bytes per send() */
+#define WS_SEND_MANY_CHUNK (256u * 1024u)
+
+wibesocket_error_t wibesocket_send_many(wibesocket_conn_t* conn, const wibesocket_message_t* msgs, size_t count, size_t* sent) {
+    wibesocket_conn* c = (wibesocket_conn*)conn;
+    if (sent) *sent = 0;
+    if (!c || (!msgs && count)) return WIBESOCKET_ERROR_INVALID_ARGS;
+    if (c->state != WIBESOCKET_STATE_OPEN) return WIBESOCKET_ERROR_NOT_READY;
+    for (size_t i = 0; i < count; i++) {
+        if (msgs[i].type != WIBESOCKET_FRAME_TEXT && msgs[i].type != WIBESOCKET_FRAME_BINARY) return WIBESOCKET_ERROR_INVALID_ARGS;
+        if (msgs[i].payload_len && !msgs[i].payload) return WIBESOCKET_ERROR_INVALID_ARGS;
+    }
+    size_t done = 0;
+    while (done < count) {
+        /* Take frames until the run is full; a single oversized frame goes alone */
+        size_t end = done, total = 0;
+        while (end < count) {
+            size_t fl = ws_frame_len(msgs[end].payload_len);
+            if (end > done && total + fl > WS_SEND_MANY_CHUNK) break;
+            total += fl; end++;
+        }
+        if (ws_frame_reserve(c, total) < 0) return WIBESOCKET_ERROR_MEMORY;
+        size_t off = 0;
+        for (size_t i = done; i < end; i++) {
+            uint8_t mask[4]; gen_mask(c, mask);
+            size_t n = ws_build_frame(c->frame_buf + off, total - off, 1, (ws_opcode_t)msgs[i].type, mask,
+                                      (const uint8_t*)msgs[i].payload, msgs[i].payload_len);
+            if (n == 0) return WIBESOCKET_ERROR_BUFFER_FULL;
+            off += n;
+        }
+        wibesocket_error_t e = ws_write_out(c, c->frame_buf, off);
+        if (e != WIBESOCKET_OK) return e;
+        done = end;
+        if (sent) *sent = done;
+    }
+    return WIBESOCKET_OK;
+}
+
 wibesocket_error_t wibesocket_send_text(wibesocket_conn_t* conn, const char* text, size_t len) {
     return send_frame((wibesocket_conn*)conn, WS_OPCODE_TEXT, text, len);
 }
@@ -320,31 +417,91 @@ wibesocket_error_t wibesocket_send_close(wibesocket_conn_t* conn, uint16_t code,
     return e;
 }
 
+/* Size of the frame at the start of buf (header + payload), or 0 if its header is incomplete */
+static size_t ws_frame_total_len(const uint8_t* buf, size_t len) {
+    if (len < 2) return 0;
+    size_t hdr = 2;
+    uint64_t plen = (uint64_t)(buf[1] & 0x7FU);
+    if (plen == 126) {
+        hdr += 2; if (len < hdr) return 0;
+        plen = ((uint64_t)buf[2] << 8) | (uint64_t)buf[3];
+    } else if (plen == 127) {
+        hdr += 8; if (len < hdr) return 0;
+        plen = 0;
+        for (int i = 0; i < 8; i++) plen = (plen << 8) | buf[2 + i];
+    }
+    if (buf[1] & 0x80U) hdr += 4;
+    if (plen > (uint64_t)(SIZE_MAX - hdr)) return SIZE_MAX;
+    return hdr + (size_t)plen;
+}
+
+/* Drop released slots from the front of the pin window. Bytes are only given back once no
+   slot is held, since every handed-out payload lives in the one contiguous recv_buf region. */
+static void ws_pins_reclaim(wibesocket_conn* c) {
+    while (c->pin_head != c->pin_tail && !c->pins[c->pin_head & (WS_PIN_SLOTS - 1)].refcnt) c->pin_head++;
+    if (c->pin_head != c->pin_tail) return;
+    c->recv_off += c->pending_consume;
+    c->pending_consume = 0;
+    if (c->recv_off == c->recv_size) c->recv_off = c->recv_size = 0;
+}
+
 wibesocket_error_t wibesocket_recv(wibesocket_conn_t* conn, wibesocket_message_t* msg, int timeout_ms) {
     wibesocket_conn* c = (wibesocket_conn*)conn;
     if (!c || c->state != WIBESOCKET_STATE_OPEN) return WIBESOCKET_ERROR_NOT_READY;
-    if (c->pinned_refcnt > 0) return WIBESOCKET_ERROR_NOT_READY;
+    if (c->pin_tail - c->pin_head == WS_PIN_SLOTS) return WIBESOCKET_ERROR_NOT_READY;
+    int pinned;
+next_frame:
+    pinned = c->pin_tail != c->pin_head;
     /* Flush any pending sends */
     ws_flush_send(c);
-    int w = wait_epoll(c->epfd, timeout_ms);
-    if (w <= 0) return WIBESOCKET_ERROR_TIMEOUT;
-    ssize_t rd = recv(c->fd, c->recv_buf + c->recv_size, c->recv_cap - c->recv_size, 0);
-    if (rd < 0) return (errno == EAGAIN || errno == EWOULDBLOCK) ? WIBESOCKET_ERROR_TIMEOUT : WIBESOCKET_ERROR_NETWORK;
-    if (rd == 0) { c->state = WIBESOCKET_STATE_CLOSED; return WIBESOCKET_ERROR_CLOSED; }
-    c->recv_size += (size_t)rd;
+    /* Serve frames already buffered before touching the socket: with edge-triggered epoll
+       there is no new readiness event for bytes an earlier recv() already pulled in.
+       Only wait once the socket is drained (EAGAIN). */
+    size_t off, total;
+    for (;;) {
+        off = c->recv_off + c->pending_consume;
+        size_t avail = c->recv_size - off;
+        total = ws_frame_total_len(c->recv_buf + off, avail);
+        if (total && total <= avail) break;
+        if (total > c->recv_cap) { c->last_error = WIBESOCKET_ERROR_PROTOCOL; return c->last_error; }
+        /* Pinned payloads can't move, so the next frame has to fit behind them */
+        if (pinned && (c->recv_size == c->recv_cap || total > c->recv_cap - off)) return WIBESOCKET_ERROR_NOT_READY;
+        if (!pinned && c->recv_off > 0) {
+            /* Only a partial frame is left; move it to the front to make room */
+            memmove(c->recv_buf, c->recv_buf + c->recv_off, avail);
+            c->recv_off = 0; c->recv_size = avail;
+        }
+        ssize_t rd = recv(c->fd, c->recv_buf + c->recv_size, c->recv_cap - c->recv_size, 0);
+        if (rd > 0) { c->recv_size += (size_t)rd; continue; }
+        if (rd == 0) { c->state = WIBESOCKET_STATE_CLOSED; return WIBESOCKET_ERROR_CLOSED; }
+        if (errno == EINTR) continue;
+        if (errno != EAGAIN && errno != EWOULDBLOCK) return WIBESOCKET_ERROR_NETWORK;
+        /* The peer may be waiting on the rest of our queued frames before it replies,
+           so keep flushing and wake on writability too while anything is queued */
+        ws_flush_send(c);
+        int want_out = c->send_off < c->send_size;
+        if (want_out != c->want_out) {
+            (void)(want_out ? ep_mod_inout(c->epfd, c->fd) : ep_mod_in(c->epfd, c->fd));
+            c->want_out = want_out;
+        }
+        if (wait_epoll(c->epfd, timeout_ms) <= 0) return WIBESOCKET_ERROR_TIMEOUT;
+    }
 
+    /* The frame is complete, so the parser consumes exactly `total` bytes in one feed */
     size_t consumed = 0; ws_parsed_frame_t fr;
-    ws_parser_status_t st = ws_parser_feed(&c->parser, c->recv_buf, c->recv_size, &consumed, &fr);
-    if (st == WS_PARSER_NEED_MORE) return WIBESOCKET_ERROR_NOT_READY;
-    if (st < 0) { c->last_error = WIBESOCKET_ERROR_PROTOCOL; return c->last_error; }
-    /* Defer sliding until payload released to keep zero-copy pointer valid */
-    c->pending_consume = consumed;
+    ws_parser_status_t st = ws_parser_feed(&c->parser, c->recv_buf + off, total, &consumed, &fr);
+    if (st != WS_PARSER_FRAME) { c->last_error = WIBESOCKET_ERROR_PROTOCOL; return c->last_error; }
+    /* Defer consuming until every pin is released to keep zero-copy pointers valid */
+    c->pending_consume += total;
 
     /* Handle control frames */
     if (fr.type == WS_OPCODE_PING) {
-        /* Respond with PONG carrying same payload */
+        /* Respond with PONG carrying same payload. Go on to the next frame rather than
+           returning: frames buffered behind a PING raise no new readiness, so a drain that
+           stopped here would strand them. PONGs are returned like data frames below. */
         (void)send_frame(c, WS_OPCODE_PONG, fr.payload, fr.payload_len);
-        return WIBESOCKET_ERROR_NOT_READY;
+        ws_pins_reclaim(c);
+        goto next_frame;
     }
     if (fr.type == WS_OPCODE_CLOSE) {
         /* Parse close code if present */
@@ -363,14 +520,51 @@ wibesocket_error_t wibesocket_recv(wibesocket_conn_t* conn, wibesocket_message_t
 
     /* Fill out message; zero-copy view into recv buffer */
     msg->type = (fr.type == WS_OPCODE_TEXT) ? WIBESOCKET_FRAME_TEXT :
-                (fr.type == WS_OPCODE_BINARY) ? WIBESOCKET_FRAME_BINARY : WIBESOCKET_FRAME_CONTINUATION;
+                (fr.type == WS_OPCODE_BINARY) ? WIBESOCKET_FRAME_BINARY :
+                (fr.type == WS_OPCODE_PONG) ? WIBESOCKET_FRAME_PONG : WIBESOCKET_FRAME_CONTINUATION;
     msg->payload = fr.payload;
     msg->payload_len = fr.payload_len;
     msg->is_final = fr.is_final;
     /* Pin the payload region to avoid reuse/memmove until released by FFI */
-    c->pinned_payload = (const uint8_t*)fr.payload;
-    c->pinned_len = fr.payload_len;
-    c->pinned_refcnt = 1;
+    ws_pin_slot_t* pin = &c->pins[c->pin_tail & (WS_PIN_SLOTS - 1)];
+    pin->seq = c->pin_tail++;
+    pin->refcnt = 1;
+    msg->slot = pin->seq;
+    return WIBESOCKET_OK;
+}
+
+wibesocket_error_t wibesocket_recv_batch(wibesocket_conn_t* conn, wibesocket_message_t* msgs, size_t max, int timeout_ms, size_t* count) {
+    wibesocket_conn* c = (wibesocket_conn*)conn;
+    if (count) *count = 0;
+    if (!c || !msgs || !max || !count) return WIBESOCKET_ERROR_INVALID_ARGS;
+    /* The first frame takes the normal path: it may wait, read, and handle control frames */
+    wibesocket_error_t e = wibesocket_recv(conn, &msgs[0], timeout_ms);
+    if (e != WIBESOCKET_OK) return e;
+    size_t n = 1;
+    /* Then every complete data frame right behind it; they sit back to back in recv_buf, so
+       they share the first frame's pin slot and one release frees the lot */
+    while (n < max) {
+        size_t off = c->recv_off + c->pending_consume;
+        size_t avail = c->recv_size - off;
+        size_t total = ws_frame_total_len(c->recv_buf + off, avail);
+        if (!total || total > avail) break;
+        /* Control frames need recv()'s handling (PONG reply, close), so end the batch there */
+        if (c->recv_buf[off] & 0x08) break;
+        size_t consumed = 0; ws_parsed_frame_t fr;
+        if (ws_parser_feed(&c->parser, c->recv_buf + off, total, &consumed, &fr) != WS_PARSER_FRAME) {
+            c->last_error = WIBESOCKET_ERROR_PROTOCOL;
+            break;
+        }
+        msgs[n].type = (fr.type == WS_OPCODE_TEXT) ? WIBESOCKET_FRAME_TEXT :
+                       (fr.type == WS_OPCODE_BINARY) ? WIBESOCKET_FRAME_BINARY : WIBESOCKET_FRAME_CONTINUATION;
+        msgs[n].payload = fr.payload;
+        msgs[n].payload_len = fr.payload_len;
+        msgs[n].is_final = fr.is_final;
+        msgs[n].slot = msgs[0].slot;
+        c->pending_consume += total;
+        n++;
+    }
+    *count = n;
     return WIBESOCKET_OK;
 }
 
@@ -401,6 +595,7 @@ wibesocket_error_t wibesocket_close(wibesocket_conn_t* conn) {
     safe_close(&c->fd);
     safe_close(&c->epfd);
     free(c->recv_buf);
+    free(c->frame_buf);
     ws_queue_free(c);
     free(c);
     return WIBESOCKET_OK;
@@ -424,26 +619,36 @@ const char* wibesocket_error_string(wibesocket_error_t error) {
     return ((unsigned)error < n) ? k_error_strings[error] : "unknown";
 }
 
+/* Most recently pinned slot that is still held, or NULL */
+static ws_pin_slot_t* ws_pins_newest(wibesocket_conn* c) {
+    for (uint32_t seq = c->pin_tail; seq != c->pin_head; ) {
+        ws_pin_slot_t* pin = &c->pins[--seq & (WS_PIN_SLOTS - 1)];
+        if (pin->refcnt) return pin;
+    }
+    return NULL;
+}
+
 void wibesocket_retain_payload(wibesocket_conn_t* conn) {
     wibesocket_conn* c = (wibesocket_conn*)conn;
     if (!c) return;
-    if (c->pinned_refcnt > 0) c->pinned_refcnt++;
+    ws_pin_slot_t* pin = ws_pins_newest(c);
+    if (pin) pin->refcnt++;
 }
 
 void wibesocket_release_payload(wibesocket_conn_t* conn) {
     wibesocket_conn* c = (wibesocket_conn*)conn;
     if (!c) return;
-    if (c->pinned_refcnt > 0) c->pinned_refcnt--;
-    if (c->pinned_refcnt == 0) {
-        /* After release, compact recv buffer by consuming the parsed frame bytes */
-        if (c->pending_consume > 0 && c->pending_consume <= c->recv_size) {
-            memmove(c->recv_buf, c->recv_buf + c->pending_consume, c->recv_size - c->pending_consume);
-            c->recv_size -= c->pending_consume;
-            c->pending_consume = 0;
-        }
-        c->pinned_payload = NULL;
-        c->pinned_len = 0;
-    }
+    ws_pin_slot_t* pin = ws_pins_newest(c);
+    if (pin) wibesocket_release_slot(conn, pin->seq);
+}
+
+void wibesocket_release_slot(wibesocket_conn_t* conn, uint32_t slot) {
+    wibesocket_conn* c = (wibesocket_conn*)conn;
+    if (!c) return;
+    ws_pin_slot_t* pin = &c->pins[slot & (WS_PIN_SLOTS - 1)];
+    /* Ignore ids that are stale or were never handed out */
+    if (slot - c->pin_head >= c->pin_tail - c->pin_head || pin->seq != slot || !pin->refcnt) return;
+    if (--pin->refcnt == 0) ws_pins_reclaim(c);
 }
 
 int wibesocket_fileno(const wibesocket_conn_t* conn) {
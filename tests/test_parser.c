@@ -124,12 +124,25 @@ static void test_close_frame_validation(void) {
     assert(s == WS_PARSER_ERROR_PROTOCOL);
 }
 
+static void test_build_frame_masked(void) {
+    /* Odd length so the vector, word and byte steps of the masker all run */
+    static uint8_t payload[1003], buf[1003 + 8];
+    for (size_t i = 0; i < sizeof(payload); i++) payload[i] = (uint8_t)(i * 7);
+    const uint8_t mask[4] = {0x12, 0x34, 0x56, 0x78};
+    size_t n = ws_build_frame(buf, sizeof(buf), 1, WS_OPCODE_BINARY, mask, payload, sizeof(payload));
+    assert(n == sizeof(buf));
+    assert(buf[1] == (0x80 | 126) && buf[2] == 0x03 && buf[3] == 0xEB);
+    assert(memcmp(buf + 4, mask, 4) == 0);
+    for (size_t i = 0; i < sizeof(payload); i++) assert(buf[8 + i] == (uint8_t)(payload[i] ^ mask[i & 3]));
+}
+
 int main(void) {
     test_short_payload_unmasked();
     test_extended_16_unmasked();
     test_control_frame_rules();
     test_utf8_validation();
     test_close_frame_validation();
+    test_build_frame_masked();
     printf("test_parser OK\n");
     return 0;
 }
@@ -10,6 +10,9 @@ int main(void) {
     assert(wibesocket_error_string(WIBESOCKET_OK) != NULL);
     assert(WIBESOCKET_FRAME_TEXT == 0x1);
     assert(WIBESOCKET_CLOSE_NORMAL == 1000);
+    assert(wibesocket_send_many(NULL, NULL, 0, NULL) == WIBESOCKET_ERROR_INVALID_ARGS);
+    assert(wibesocket_recv_batch(NULL, NULL, 0, 0, NULL) == WIBESOCKET_ERROR_INVALID_ARGS);
+    wibesocket_release_slot(NULL, 0);
 
     /* Optional smoke connect if env set */
     const char* uri = getenv("WIBESOCKET_TEST_ECHO_URI");
@@ -25,6 +28,62 @@ int main(void) {
             (void)wibesocket_send_text(c, msg, strlen(msg));
             wibesocket_message_t m; memset(&m,0,sizeof(m));
             (void)wibesocket_recv(c, &m, 1000);
+            wibesocket_release_payload(c);
+
+            wibesocket_message_t batch[3];
+            memset(batch, 0, sizeof(batch));
+            const char* words[3] = {"one", "two", "three"};
+            for (int i = 0; i < 3; i++) {
+                batch[i].type = WIBESOCKET_FRAME_TEXT;
+                batch[i].payload = words[i];
+                batch[i].payload_len = strlen(words[i]);
+            }
+            size_t sent = 0;
+            assert(wibesocket_send_many(c, batch, 3, &sent) == WIBESOCKET_OK && sent == 3);
+            for (int i = 0; i < 3; i++) {
+                memset(&m, 0, sizeof(m));
+                if (wibesocket_recv(c, &m, 1000) != WIBESOCKET_OK) break;
+                assert(m.payload_len == strlen(words[i]) && memcmp(m.payload, words[i], m.payload_len) == 0);
+                wibesocket_release_payload(c);
+            }
+            /* Same batch again, taken back zero-copy through recv_batch */
+            assert(wibesocket_send_many(c, batch, 3, NULL) == WIBESOCKET_OK);
+            wibesocket_message_t in[3];
+            size_t got = 0;
+            while (got < 3) {
+                size_t n = 0;
+                if (wibesocket_recv_batch(c, in, 3 - got, 1000, &n) != WIBESOCKET_OK) break;
+                for (size_t i = 0; i < n; i++) {
+                    assert(in[i].payload_len == strlen(words[got + i]));
+                    assert(memcmp(in[i].payload, words[got + i], in[i].payload_len) == 0);
+                }
+                wibesocket_release_payload(c);
+                got += n;
+            }
+            assert(got == 3);
+            /* Several payloads held at once, released out of order */
+            assert(wibesocket_send_many(c, batch, 3, NULL) == WIBESOCKET_OK);
+            for (int i = 0; i < 3; i++) {
+                if (wibesocket_recv(c, &in[i], 1000) != WIBESOCKET_OK) break;
+                assert(in[i].payload_len == strlen(words[i]) && memcmp(in[i].payload, words[i], in[i].payload_len) == 0);
+            }
+            assert(memcmp(in[0].payload, "one", 3) == 0);
+            wibesocket_release_slot(c, in[1].slot);
+            wibesocket_release_slot(c, in[1].slot); /* stale: ignored */
+            assert(memcmp(in[0].payload, "one", 3) == 0 && memcmp(in[2].payload, "three", 5) == 0);
+            wibesocket_release_slot(c, in[0].slot);
+            wibesocket_release_slot(c, in[2].slot);
+            /* The peer's PONG comes back to the caller, ahead of the frame sent after the PING */
+            assert(wibesocket_send_ping(c, "hb", 2) == WIBESOCKET_OK);
+            assert(wibesocket_send_text(c, "after", 5) == WIBESOCKET_OK);
+            assert(wibesocket_recv(c, &m, 1000) == WIBESOCKET_OK);
+            assert(m.type == WIBESOCKET_FRAME_PONG && m.payload_len == 2 && memcmp(m.payload, "hb", 2) == 0);
+            wibesocket_release_slot(c, m.slot);
+            assert(wibesocket_recv(c, &m, 1000) == WIBESOCKET_OK);
+            assert(m.type == WIBESOCKET_FRAME_TEXT && m.payload_len == 5);
+            wibesocket_release_slot(c, m.slot);
+            batch[0].type = WIBESOCKET_FRAME_PING;
+            assert(wibesocket_send_many(c, batch, 1, NULL) == WIBESOCKET_ERROR_INVALID_ARGS);
             (void)wibesocket_send_close(c, WIBESOCKET_CLOSE_NORMAL, "bye");
             (void)wibesocket_close(c);
         }
@@ -1,5 +1,9 @@
 import os
 import asyncio
+import array
+import fcntl
+import socket
+import termios
 import time
 import unittest
 
@@ -7,24 +11,106 @@ from wibesocket import WebSocket
 from wibesocket import AsyncWebSocket
 
 ECHO_URI = os.environ.get("WIBESOCKET_TEST_ECHO_URI", "ws://127.0.0.1:8765")
+# Diagnostics are opt-in so the tests can double as smoke benchmarks
+VERBOSE = bool(os.environ.get("WIBESOCKET_TEST_VERBOSE"))
+
+
+class _CountingAsyncWebSocket(AsyncWebSocket):
+    """Records how many frames each reader wakeup drains."""
+
+    def __init__(self, ws, loop=None):
+        self.drained = []
+        recv_bulk = ws.recv_bulk
+
+        def counting_recv_bulk(n, timeout_ms=0):
+            frames = recv_bulk(n, timeout_ms)
+            self.drained[-1] += len(frames)
+            return frames
+
+        ws.recv_bulk = counting_recv_bulk
+        super().__init__(ws, loop)
+
+    def _on_readable(self) -> None:
+        self.drained.append(0)
+        super()._on_readable()
+
+
+def _wait_buffered(fd, nbytes, timeout):
+    """Wait until the kernel holds at least nbytes unread on fd; False on timeout."""
+    avail = array.array("i", [0])
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        fcntl.ioctl(fd, termios.FIONREAD, avail)
+        if avail[0] >= nbytes:
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class _FailingWebSocket:
+    """Stand-in connection whose reads fail, as after the peer drops the link."""
+
+    def __init__(self):
+        self._sock, self._peer = socket.socketpair()
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def recv_bulk(self, n, timeout_ms=0):
+        raise RuntimeError("connection lost")
+
+    def close(self, code=1000, reason=None):
+        self._sock.close()
+        self._peer.close()
 
 
 class TestAsyncioClient(unittest.IsolatedAsyncioTestCase):
     async def test_asyncio_connect_send_recv(self):
-        print(f"[asyncio] connecting to {ECHO_URI}")
+        if VERBOSE:
+            print(f"[asyncio] connecting to {ECHO_URI}")
+        try:
+            ws = WebSocket.connect(ECHO_URI, handshake_timeout_ms=4000, max_frame_size=1 << 20)
+        except Exception:
+            self.skipTest("connect failed (no network or server), skipping")
+            return
+        with AsyncWebSocket(ws) as aws:
+            payload = f"hello-async-{time.monotonic_ns()}"
+            aws.send_text(payload)
+            fr = await aws.recv(timeout=5.0)
+            with fr:
+                if VERBOSE:
+                    print("[asyncio] recv:", fr.type, bytes(fr.data[:64]), "final:", fr.is_final)
+                self.assertIn("hello-async-", fr.text(errors="ignore"))
+
+    async def test_asyncio_burst_drained_per_wakeup(self):
         try:
             ws = WebSocket.connect(ECHO_URI, handshake_timeout_ms=4000, max_frame_size=1 << 20)
         except Exception:
             self.skipTest("connect failed (no network or server), skipping")
             return
-        aws = AsyncWebSocket(ws)
-        payload = f"hello-async-{int(time.time())}"
-        aws.send_text(payload)
-        fr = await aws.recv(timeout=5.0)
-        with fr:
-            print("[asyncio] recv:", fr.type, fr.data.tobytes()[:64], "final:", fr.is_final)
-            self.assertIn("hello-async-", fr.text(errors="ignore"))
-        aws.close()
+        payloads = [f"burst-{i}" for i in range(64)]
+        ws.send_many(payloads)
+        # Let the whole echo land before the reader exists, so it arrives as one burst.
+        # Server frames are unmasked with a 2-byte header at these sizes
+        expected = sum(2 + len(p) for p in payloads)
+        self.assertTrue(_wait_buffered(ws.fileno(), expected, 10.0), "echo burst did not arrive")
+        received = []
+        with _CountingAsyncWebSocket(ws) as aws:
+            for _ in payloads:
+                fr = await aws.recv(timeout=5.0)
+                with fr:
+                    received.append(fr.text())
+        self.assertEqual(received, payloads)
+        # One wakeup takes every frame already readable instead of one frame per callback
+        self.assertEqual(aws.drained[0], len(payloads))
+
+    async def test_asyncio_read_error_reaches_later_recv(self):
+        # The error comes in while nobody awaits; recv() must raise it, not wait on a dead reader
+        with AsyncWebSocket(_FailingWebSocket()) as aws:
+            aws._on_readable()
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    await aws.recv()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestImport(unittest.TestCase):
+    def test_package_import(self):
+        # The wrappers bind _core functions at import time, so this catches import-order cycles
+        import wibesocket
+
+        for name in wibesocket.__all__:
+            self.assertTrue(hasattr(wibesocket, name), name)
+        self.assertTrue(callable(wibesocket.recv))
+        self.assertIsNotNone(wibesocket.WebSocket)
+        self.assertIsNotNone(wibesocket.AsyncWebSocket)
+
+    def test_import_skips_asyncio(self):
+        # Fresh interpreter: this one already has asyncio from the other tests
+        code = "import sys, wibesocket; print('asyncio' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
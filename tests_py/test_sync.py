@@ -7,35 +7,86 @@ from wibesocket import WebSocket
 
 
 ECHO_URI = os.environ.get("WIBESOCKET_TEST_ECHO_URI", "ws://127.0.0.1:8765")
+# Diagnostics are opt-in so the tests can double as smoke benchmarks
+VERBOSE = bool(os.environ.get("WIBESOCKET_TEST_VERBOSE"))
 
 
 class TestSyncClient(unittest.TestCase):
-    def test_connect_send_recv(self):
-        print(f"[sync] connecting to {ECHO_URI}")
+    # One connection for the whole class; payloads carry a per-run token so echoes correlate
+    ws = None
+
+    @classmethod
+    def setUpClass(cls):
+        if VERBOSE:
+            print(f"[sync] connecting to {ECHO_URI}")
         try:
-            ws = WebSocket.connect(ECHO_URI, handshake_timeout_ms=4000, max_frame_size=1 << 20)
+            cls.ws = WebSocket.connect(ECHO_URI, handshake_timeout_ms=4000, max_frame_size=1 << 20)
         except Exception:
-            self.skipTest("connect failed (no network or server), skipping")
-            return
+            raise unittest.SkipTest("connect failed (no network or server), skipping")
+        cls.token = f"{os.getpid()}-{time.monotonic_ns()}"
+        # Encoded once; send_text takes UTF-8 bytes as-is
+        cls.payload = f"hello-sync-{cls.token}".encode()
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.ws is not None:
+            cls.ws.close()
 
-        payload = f"hello-sync-{int(time.time())}"
+    def test_connect_send_recv(self):
+        ws = self.ws
+        payload = self.payload
         ws.send_text(payload)
-        print("[sync] send_text: True")
-
-        deadline = time.time() + 5.0
-        received = None
-        while time.time() < deadline:
-            fr = ws.recv(timeout_ms=500)
-            if fr is None:
-                continue
-            with fr:
-                print("[sync] recv:", fr.type, fr.data.tobytes()[:64], "final:", fr.is_final)
-                received = fr.text(errors="ignore")
-            break
-
-        ws.close()
-        self.assertIsNotNone(received, "did not receive echo")
-        self.assertIn("hello-sync-", received)
+        if VERBOSE:
+            print("[sync] send_text: True")
+
+        # One call covers the whole deadline: waiting and matching both happen in C
+        fr = ws.recv_until(payload, timeout_ms=5000)
+        self.assertIsNotNone(fr, "did not receive echo")
+        with fr:
+            if VERBOSE:
+                print("[sync] recv:", fr.type, bytes(fr.data[:64]), "final:", fr.is_final)
+            # memoryview == bytes compares in place: no copy and no UTF-8 decode
+            self.assertEqual(fr.data, payload)
+
+    def test_bulk_send_recv(self):
+        ws = self.ws
+        payloads = [f"bulk-{self.token}-{i}" for i in range(16)]
+        ws.send_text_bulk(payloads)
+
+        deadline = time.monotonic() + 5.0
+        received = []
+        while len(received) < len(payloads) and time.monotonic() < deadline:
+            for fr in ws.recv_bulk(len(payloads), timeout_ms=500):
+                received.append(fr.text())
+
+        self.assertEqual(received, payloads)
+
+    def test_recv_message(self):
+        ws = self.ws
+        # Larger than the 64 KiB starting buffer, so the capped growth path runs too
+        payload = self.payload * (100_000 // len(self.payload))
+        ws.send_binary(payload)
+        fr = ws.recv_message(max_bytes=1 << 20, timeout_ms=5000)
+        self.assertIsNotNone(fr, "did not receive echo")
+        self.assertEqual(fr.data, payload)
+
+    def test_release_twice_across_recv(self):
+        ws = self.ws
+        first, second = (f"rel-{self.token}-{i}".encode() for i in range(2))
+        ws.send_text(first)
+        fr = ws.recv_until(first, timeout_ms=5000)
+        self.assertIsNotNone(fr, "did not receive echo")
+        fr.release()
+        ws.send_text(second)
+        nxt = ws.recv_until(second, timeout_ms=5000)
+        self.assertIsNotNone(nxt, "did not receive echo")
+        with nxt:
+            self.assertIsNot(nxt, fr)
+            # A stale release must not unpin the newer frame's payload
+            fr.release()
+            self.assertIsNone(fr.data)
+            self.assertIn("released", repr(fr))
+            self.assertEqual(nxt.data, second)
 
 
 if __name__ == "__main__":